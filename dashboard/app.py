@@ -1,39 +1,146 @@
 import os
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 import pandas as pd
 from shiny import App, ui, reactive, render
 from shinywidgets import output_widget, render_widget
+from starlette.applications import Starlette
+from starlette.datastructures import MutableHeaders
+from starlette.middleware import Middleware
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Mount, Route
 
+import warmup
+from plots import cache
 from plots import map
+from plots import metrics
+from plots import figcache
+from plots import instrument
+from plots import payload
+from plots import xlsx
 from plots import crime_rate
 from plots import population_facility
 from plots import park_area
 from plots import traffic
 from plots import air_pollution
-from plots.radar import plot_radar_chart
+from plots import radar
+from plots import regions
+from plots.utils import highlight_bar
+from shared import DATA_FILES, SOURCES, GEOJSON_FP, MAP_HTML_FP, www_dir
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+# --- 시군구 × 지표 통합 테이블 (plots/metrics.py, 데이터 버전당 한 번만 계산) ---
+def load_metrics():
+    return metrics.get_metrics(*DATA_FILES)
+
+# --- 차트 id → (전국 지표 테이블, 시도, 선택 지역) → plotly Figure ---
+CHARTS = {
+    "radar": lambda table, province, region: radar.plot_radar_chart(metrics.radar_scores(table, province), region),
+    "crime": lambda table, province, region: crime_rate.plot_crime_rate(metrics.indicator(table, "crime", province), region),
+    "facility": lambda table, province, region: population_facility.plot_population_facility_ratio(metrics.indicator(table, "facility", province), region),
+    "park": lambda table, province, region: park_area.plot_park_area(metrics.indicator(table, "park", province), region),
+    "air": lambda table, province, region: air_pollution.plot_stacked_bar(metrics.pollutant_means(table, province), region),
+    "accident": lambda table, province, region: traffic.plot_accident_data(metrics.indicator(table, "accident", province), region),
+}
+
+def chart_json(chart_id, table, province, region):
+    # 같은 (차트, 시도, 지역, 데이터 버전)의 그래프는 모든 세션이 공유하는 JSON 캐시(plots/figcache.py)에서 꺼냄
+    version = table.attrs["data_version"]
+    return figcache.get_json(chart_id, province, region, version, lambda: CHARTS[chart_id](table, province, region))
+
+# --- 시작 시 warm-up ---
+# 첫 사용자가 기다리지 않도록 지도 생성, 원본 데이터 읽기, 지표 계산, 초기 그래프 생성을 미리 해 둠
+def warm_map():
+    # 보통은 배포 시 `cli.py build-map`으로 미리 만들어 둔 것을 그대로 씀 (GeoJSON·생성 코드가 바뀌었을 때만 다시 생성)
+    # GeoJSON도 기존 지도도 없으면 지도만 비워 두고 준비 상태는 막지 않음
+    if not os.path.exists(GEOJSON_FP):
+        if not os.path.exists(MAP_HTML_FP):
+            logging.getLogger("dashboard.map").warning("GeoJSON과 지도 HTML 없음 → 지도 없이 시작: %s", GEOJSON_FP)
+        else:
+            logging.getLogger("dashboard.map").warning("GeoJSON 없음 → 기존 지도 사용: %s", MAP_HTML_FP)
+        return
+    report = map.build_map(GEOJSON_FP, MAP_HTML_FP)
+    if report is not None:
+        logging.getLogger("dashboard.map").info("지도 다시 생성: HTML %dB, 경계 %s", report["html_bytes"],
+                                                ", ".join(f"{level['bytes']}B" for level in report["levels"]))
+
+def warm_widgets():
+    # 위젯 JS 번들(약 5MB)을 www/widgets/에 정적 파일로 둠 → 세션마다 위젯 6개에 실어 보내지 않고 브라우저가 한 번만 받음
+    # (www에 쓸 수 없으면 예전처럼 위젯마다 JS를 보냄)
+    if payload.publish_widget_bundle(www_dir) is None:
+        logging.getLogger("dashboard.widgets").warning("위젯 JS 번들을 게시하지 못함 → 위젯마다 JS 전송")
 
-# --- Folium 지도 HTML 경로 설정 및 생성 ---
-map_html_path = os.path.join(os.getcwd(), "dashboard/www/gyeongbuk_map.html")
-geojson_path = os.path.join(os.getcwd(), "dashboard/data/gyeongbuk_polygon_4326.geojson")
+def warm_datasets():
+    # 게시된 지표 테이블이 있으면 원본 데이터는 필요 없음 (worker마다 원본을 메모리에 올리지 않음)
+    if metrics.published(*DATA_FILES):
+        return
+    # 원본 하나가 없거나 읽을 수 없어도 준비 상태를 막지 않음 (그 지표만 빠지고 나머지 차트는 표시)
+    for source_path, loader in SOURCES:
+        if not os.path.exists(source_path):
+            logging.getLogger("dashboard.data").warning("원본 없음 → 건너뜀: %s", source_path)
+            continue
+        try:
+            cache.load_source(source_path, loader)
+        except Exception:
+            logging.getLogger("dashboard.data").exception("원본 읽기 실패 → 건너뜀: %s", source_path)
 
-if not os.path.exists(map_html_path):
-    map.generate_interactive_map(geojson_path, output_path=map_html_path)
+def warm_figures():
+    # 세션이 보여 줄 시도: 선택 목록(모든 지표가 있는 시도), 목록이 비면 선택 상자의 기본값(경상북도)
+    table = load_metrics()
+    for province in metrics.provinces(table) or [regions.GYEONGBUK]:
+        for chart_id in CHARTS:
+            figcache.get_json(chart_id, province, None, table.attrs["data_version"],
+                              lambda: CHARTS[chart_id](table, province, None))
 
-# --- 선택된 지역 상태 저장용 변수 ---
-selected_region = reactive.Value(None)
+WARMUP_STEPS = [
+    ("map", warm_map),
+    ("widgets", warm_widgets),
+    ("datasets", warm_datasets),
+    ("metrics", load_metrics),
+    ("figures", warm_figures),
+]
 
 # --- UI 구성 ---
 app_ui = ui.page_fluid(
     ui.panel_title("반려동물 친화 환경 대시보드"),
 
-    # 메시지 수신 스크립트
+    # 시도 선택 (목록은 서버에서 지표가 모두 있는 시도로 갱신)
+    ui.input_select("province", "시도", choices=[regions.GYEONGBUK], selected=regions.GYEONGBUK, width="200px"),
+
+    # 지도 iframe ↔ 대시보드 메시지 중계 스크립트
+    #   지도 → 서버: {type: "select", region} → input.selected_region
+    #   서버 → 지도: session.send_custom_message("map_scores" / "map_selected") → iframe으로 postMessage
+    #   지도가 늦게 뜨면({type: "ready"}) 마지막으로 받은 상태를 다시 보냄
     ui.tags.script("""
     document.addEventListener("DOMContentLoaded", function() {
+        const latest = {};
+
+        function toMap(message) {
+            const frame = document.getElementById("region_map");
+            if (frame && frame.contentWindow) {
+                frame.contentWindow.postMessage(message, window.location.origin);
+            }
+        }
+
         window.addEventListener("message", function(event) {
+            if (event.origin !== window.location.origin || !event.data) return;
             console.log("전달받은 메시지:", event.data);
-            if (event.data && typeof event.data === 'string') {
-                Shiny.setInputValue("selected_region", event.data, {priority: "event"});
+            if (event.data.type === "select" && typeof event.data.region === "string") {
+                Shiny.setInputValue("selected_region", event.data.region, {priority: "event"});
+            } else if (event.data.type === "ready") {
+                Object.values(latest).forEach(toMap);
             }
         });
+
+        ["map_scores", "map_selected"].forEach(function(type) {
+            Shiny.addCustomMessageHandler(type, function(message) {
+                latest[type] = Object.assign({type: type}, message);
+                toMap(latest[type]);
+            });
+        });
     });
     """),
 
@@ -67,6 +174,7 @@ app_ui = ui.page_fluid(
             ui.card(
                 ui.card_header("클릭 가능한 시군구 지도"),
                 ui.tags.iframe(
+                    id="region_map",
                     src="gyeongbuk_map.html",
                     width="100%",
                     height="530px",
@@ -77,12 +185,12 @@ app_ui = ui.page_fluid(
         ui.column(
             4,
             ui.card(
-                ui.card_header("경상북도 시군구별 1인당 범죄 건수"),
+                ui.card_header("시군구별 1인당 범죄 건수"),
                 output_widget("plot_crime"),
                 style="height: 290px; overflow: hidden;"
             ),
             ui.card(
-                ui.card_header("경상북도 시군구별 1인당 반려동물 관련 시설 수(μ=10⁻⁶)"),
+                ui.card_header("시군구별 1인당 반려동물 관련 시설 수(μ=10⁻⁶)"),
                 output_widget("plot_facility"),
                 style="height: 290px; overflow: hidden;"
             )
@@ -93,7 +201,7 @@ app_ui = ui.page_fluid(
         ui.column(
             4,
             ui.card(
-                ui.card_header("경상북도 시군구별 연간 대기오염도"),
+                ui.card_header("시군구별 연간 대기오염도"),
                 output_widget("plot_air"),
                 style="height: 300px; overflow: hidden;"
             )
@@ -101,7 +209,7 @@ app_ui = ui.page_fluid(
         ui.column(
             4,
             ui.card(
-                ui.card_header("경상북도 시군구별 1인당 도시공원 면적(㎡)"),
+                ui.card_header("시군구별 1인당 도시공원 면적(㎡)"),
                 output_widget("plot_park"),
                 style="height: 300px; overflow: hidden;"
             )
@@ -109,7 +217,7 @@ app_ui = ui.page_fluid(
         ui.column(
             4,
             ui.card(
-                ui.card_header("경상북도 시군구별 인구 수 대비 교통사고 건수"),
+                ui.card_header("시군구별 인구 수 대비 교통사고 건수"),
                 output_widget("plot_accident"),
                 style="height: 300px; overflow: hidden;"
             )
@@ -118,13 +226,70 @@ app_ui = ui.page_fluid(
 )
 
 # --- 서버 구성 ---
+# 분석(analyze_*)은 선택 지역과 무관하므로 reactive.calc로 분리해 한 번만 계산하고,
+# 그래프는 세션당 한 번 FigureWidget으로 만든 뒤 selected_region이 바뀔 때 강조 색상만 갱신
+# → 지역 클릭 시 analyze_* 함수도, 그래프 생성도 다시 실행되지 않음
+# 지표 계산과 그래프 생성(pandas/plotly)은 ExtendedTask + 작업 스레드에서 실행
+# → Shiny의 reactive lock을 잡지 않으므로 느린 차트 하나가 다른 차트나 다른 세션을 막지 않음
+#   (render 함수 안에서 await 하면 lock을 잡은 채로 기다리게 되어 같은 프로세스의 모든 세션이 멈춤)
 def server(input, output, session):
 
+    # 선택된 지역 상태 (세션마다 따로 관리)
+    selected_region = reactive.Value(None)
+
     @reactive.effect
     @reactive.event(input.selected_region)
     def _():
         selected_region.set(input.selected_region())
 
+    # --- 지표 테이블 (selected_region에 의존하지 않음) ---
+    # 통합 테이블은 데이터 버전당 한 번만 계산되고, 각 차트는 그 일부분만 잘라서 사용
+    @reactive.extended_task
+    async def metrics_task():
+        return await asyncio.to_thread(load_metrics)
+
+    @reactive.effect
+    def _():
+        metrics_task.invoke()
+
+    @reactive.calc
+    def metrics_table():
+        return metrics_task.result()  # 계산이 끝나기 전에는 여기서 조용히 중단 (출력은 계산 중 상태 유지)
+
+    @reactive.calc
+    def radar_scores():
+        return metrics.radar_scores(metrics_table(), input.province())
+
+    # --- 시도 선택 (전국 테이블을 자르기만 하므로 다시 계산하지 않음) ---
+    @reactive.effect
+    def _():
+        choices = metrics.provinces(metrics_table())
+        with reactive.isolate():
+            current = input.province()
+        if choices:
+            ui.update_select("province", choices=choices, selected=current if current in choices else choices[0])
+
+    # 시도가 바뀌면 선택 지역 초기화
+    @reactive.effect
+    @reactive.event(input.province, ignore_init=True)
+    def _():
+        selected_region.set(None)
+
+    # --- 지도로 상태 보내기 ---
+    # 지도는 받은 점수로 색을, 선택 지역으로 테두리를 브라우저 안에서 바꿈 → 클릭마다 지도를 다시 만들지 않음
+    @reactive.effect
+    async def _():
+        scores = metrics.composite_scores(metrics_table(), input.province())
+        await session.send_custom_message("map_scores", {
+            "label": "종합 점수",
+            "scores": {region: round(float(score), 3) for region, score in scores.items()},
+        })
+
+    @reactive.effect
+    async def _():
+        await session.send_custom_message("map_selected", {"region": selected_region()})
+
+    # --- 출력 (선택 지역 강조만 담당) ---
     @output
     @render.text
     def selected_region_text():
@@ -134,60 +299,162 @@ def server(input, output, session):
         else:
             return "보고싶은 지역을 클릭해 주세요."
 
+    # --- 그래프 (세션·시도당 한 번만 FigureWidget으로 생성) ---
+    # 차트마다 ExtendedTask 하나: 작업 스레드에서 그래프 JSON을 만들고(캐시에 있으면 바로 꺼냄),
+    # 끝나는 차트부터 FigureWidget으로 바꿔 보냄
+    # 생성 시점의 선택 지역은 isolate로 읽어서, 지역 클릭이 그래프 재생성을 일으키지 않게 함
+    def chart_task(chart_id):
+        @reactive.extended_task
+        async def task(table, province, region):
+            return await asyncio.to_thread(chart_json, chart_id, table, province, region)
+
+        @reactive.effect
+        def _():
+            table = metrics_table()
+            province = input.province()
+            with reactive.isolate():
+                region = selected_region()
+            task.invoke(table, province, region)
+
+        return task
+
+    chart_tasks = {chart_id: chart_task(chart_id) for chart_id in CHARTS}
+
+    # 게시한 위젯 JS 번들을 불러오는 모듈 (warm-up 전에 시작한 세션이면 None → JS를 위젯마다 보냄)
+    widget_esm = payload.widget_esm()
+
+    def chart_widget(chart_id):
+        fig_json = chart_tasks[chart_id].result()  # 결과가 나오기 전에는 여기서 중단 (계측하지 않음)
+        with instrument.span("render", f"plot_{chart_id}", session=session.id):
+            return figcache.as_widget(fig_json, widget_esm)
+
     @output
     @render_widget
     def plot_radar():
-        return plot_radar_chart(
-            park_fp="dashboard/data/시군별_공원_면적.xlsx",
-            acc_fp="dashboard/data/경상북도 시도별 교통사고 건수.xlsx",
-            facility_fp="dashboard/data/한국문화정보원_전국 반려동물 동반 가능 문화시설 위치 데이터_20221130.csv",
-            pop_fp="dashboard/data/경상북도 주민등록.xlsx",
-            crime_fp="dashboard/data/경찰청_범죄 발생 지역별 통계.xlsx",
-            pollution_fp="dashboard/data/월별_도시별_대기오염도.xlsx",
-            selected_region=selected_region()
-        )
+        return chart_widget("radar")
 
     @output
     @render_widget
     def plot_crime():
-        region = selected_region()
-        df = crime_rate.analyze_crime_rate(
-            "dashboard/data/경찰청_범죄 발생 지역별 통계.xlsx",
-            "dashboard/data/경상북도 주민등록.xlsx"
-        )
-        return crime_rate.plot_crime_rate(df, region)
+        return chart_widget("crime")
 
     @output
     @render_widget
     def plot_facility():
-        region = selected_region()
-        df = population_facility.analyze_population_facility_ratio(
-            "dashboard/data/한국문화정보원_전국 반려동물 동반 가능 문화시설 위치 데이터_20221130.csv",
-            "dashboard/data/경상북도 주민등록.xlsx"
-        )
-        return population_facility.plot_population_facility_ratio(df, region)
+        return chart_widget("facility")
 
     @output
     @render_widget
     def plot_park():
-        region = selected_region()
-        df = park_area.analyze_park_area("dashboard/data/시군별_공원_면적.xlsx")
-        return park_area.plot_park_area(df, region)
+        return chart_widget("park")
 
     @output
     @render_widget
     def plot_air():
-        region = selected_region()
-        df = air_pollution.analyze_air_pollution_data("dashboard/data/월별_도시별_대기오염도.xlsx")
-        return air_pollution.plot_stacked_bar(df, region)
+        return chart_widget("air")
 
     @output
     @render_widget
     def plot_accident():
-        region = selected_region()
-        df = traffic.analyze_accident_data("dashboard/data/경상북도 시도별 교통사고 건수.xlsx")
-        return traffic.plot_accident_data(df, region)
+        return chart_widget("accident")
+
+    # --- 지역 선택 시 강조만 갱신 ---
+    # 그래프 전체를 다시 보내지 않고 색상/투명도 속성 변경분만 batch_update로 전송
+    def highlight_on_select(render_fn, highlight):
+        @reactive.effect
+        def _():
+            region = selected_region()
+            widget = render_fn.widget  # 아직 그려지지 않았으면 여기서 중단됨
+            with widget.batch_update():
+                highlight(widget, region)
+
+    highlight_on_select(plot_radar, lambda fig, region: radar.highlight_radar(fig, radar_scores(), region))
+    highlight_on_select(plot_crime, highlight_bar)
+    highlight_on_select(plot_facility, highlight_bar)
+    highlight_on_select(plot_park, highlight_bar)
+    highlight_on_select(plot_air, air_pollution.highlight_stacked_bar)
+    highlight_on_select(plot_accident, highlight_bar)
+
+# --- 상태 확인 route ---
+# /healthz: 프로세스가 살아 있으면 항상 200
+# /ready:   warm-up이 끝나야 200 (그 전에는 503) → 로드밸런서가 준비된 인스턴스로만 보내도록
+# /metrics: 계측 값 (worker마다 따로 쌓이므로 worker label로 구분)
+async def healthz(request):
+    return PlainTextResponse("ok")
+
+async def ready(request):
+    status = warmup.status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+# /metrics: Prometheus 텍스트 - 호출별 시간·CPU·행 수·그래프 크기 히스토그램(plots/instrument.py) + 캐시 통계
+def cache_gauges():
+    fig = figcache.stats()
+    datasets = cache.info()
+    sheets = xlsx.stats()
+    return [
+        ("dashboard_figure_cache_hits_total", "그래프 JSON 캐시 적중", "counter", [({}, fig["hits"])]),
+        ("dashboard_figure_cache_misses_total", "그래프 JSON 캐시 실패", "counter", [({}, fig["misses"])]),
+        ("dashboard_figure_cache_evictions_total", "그래프 JSON 캐시에서 밀려난 항목", "counter", [({}, fig["evictions"])]),
+        ("dashboard_figure_cache_entries", "그래프 JSON 캐시 항목 수", "gauge", [({}, fig["entries"])]),
+        ("dashboard_dataset_cache_entries", "데이터셋 캐시에 올라간 파일 수", "gauge", [({}, len(datasets))]),
+        ("dashboard_xlsx_rows", "시트별 마지막 읽기 행 수", "gauge",
+         [({"file": s["file"], "sheet": s["sheet"]}, s["rows"]) for s in sheets]),
+        ("dashboard_xlsx_bytes", "시트별 마지막 읽기 바이트 수 (압축 해제 기준)", "gauge",
+         [({"file": s["file"], "sheet": s["sheet"]}, s["bytes"]) for s in sheets if s["bytes"] is not None]),
+        ("dashboard_xlsx_seconds", "시트별 마지막 읽기 시간", "gauge",
+         [({"file": s["file"], "sheet": s["sheet"]}, s["seconds"]) for s in sheets]),
+        ("dashboard_ready", "warm-up 완료 여부", "gauge", [({}, int(warmup.status()["ready"]))]),
+    ]
+
+async def metrics_endpoint(request):
+    return PlainTextResponse(instrument.prometheus_text(cache_gauges()), media_type="text/plain; version=0.0.4")
 
 # --- 앱 실행 ---
-static_path = os.path.join(os.getcwd(), "dashboard/www")
-app = App(app_ui, server, static_assets=static_path)
+# --- 정적 파일 캐시 헤더 ---
+# 내용 해시가 이름에 붙은 경계 geometry(/map/*)와 위젯 JS 번들(/widgets/*)은 1년 동안 그대로 캐시,
+# 지도 HTML은 이름이 고정이므로 매번 재검증(바뀌지 않았으면 304)
+CACHE_RULES = [
+    ("/map/", "public, max-age=31536000, immutable"),
+    ("/widgets/", "public, max-age=31536000, immutable"),
+    ("/gyeongbuk_map.html", "no-cache"),
+]
+
+class CacheControl:
+    def __init__(self, app, rules):
+        self.app = app
+        self.rules = rules
+
+    async def __call__(self, scope, receive, send):
+        value = None
+        if scope["type"] == "http":
+            value = next((v for prefix, v in self.rules if scope["path"].startswith(prefix)), None)
+        if value is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cache_control(message):
+            # 정상 응답에만 붙임 (404 등이 오래 캐시되지 않게)
+            if message["type"] == "http.response.start" and message["status"] in (200, 304):
+                MutableHeaders(scope=message)["Cache-Control"] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_cache_control)
+
+shiny_app = App(app_ui, server, static_assets=str(www_dir))
+
+@asynccontextmanager
+async def lifespan(_):
+    warmup.start(WARMUP_STEPS)
+    async with shiny_app.starlette_app.router.lifespan_context(shiny_app.starlette_app):
+        yield
+
+app = Starlette(
+    routes=[
+        Route("/healthz", healthz),
+        Route("/ready", ready),
+        Route("/metrics", metrics_endpoint),
+        Mount("/", app=shiny_app),
+    ],
+    middleware=[Middleware(CacheControl, rules=CACHE_RULES)],
+    lifespan=lifespan,
+)
@@ -0,0 +1,40 @@
+# benchmarks/bench_analysis.py
+# analyze_* / 통합 테이블 계산 시간 (원본 읽기는 setup에서 캐시에 올려 두고 분석만 측정)
+from plots import air_pollution, cache, crime_rate, metrics, park_area, population, population_facility, traffic
+
+from benchmarks import fixtures
+
+
+class Analyze:
+    params = [1, 10, 100]
+    param_names = ["scale"]
+
+    def setup(self, scale):
+        self.paths = fixtures.ensure(scale)
+        self.files = fixtures.data_files(self.paths)
+        cache.clear()
+        metrics.build_metrics(*self.files)  # 모든 원본을 데이터셋 캐시에 올림
+
+    def time_park_area(self, scale):
+        park_area.analyze_park_area(self.paths["park"], self.paths["population"])
+
+    def time_population_facility(self, scale):
+        population_facility.analyze_population_facility_ratio(self.paths["facility"], self.paths["population"])
+
+    def time_accident(self, scale):
+        traffic.analyze_accident_data(self.paths["accident"], self.paths["population"])
+
+    def time_crime_rate(self, scale):
+        crime_rate.analyze_crime_rate(self.paths["crime"], self.paths["population"])
+
+    def time_air_pollution(self, scale):
+        air_pollution.analyze_air_pollution_data(self.paths["pollution"])
+
+    def time_population(self, scale):
+        population.get_population(self.paths["population"])
+
+    def time_build_metrics(self, scale):
+        metrics.build_metrics(*self.files)
+
+    def track_metrics_rows(self, scale):
+        return len(metrics.build_metrics(*self.files))
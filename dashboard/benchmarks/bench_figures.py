@@ -0,0 +1,79 @@
+# benchmarks/bench_figures.py
+# 그래프 생성(plot_*)과 JSON 직렬화(payload.to_json - figcache와 같은 방식)를 따로 측정 - 입력은 app.py와 같은 통합 테이블 조각
+from plots import air_pollution, crime_rate, metrics, park_area, payload, population_facility, radar, regions, traffic
+
+from benchmarks import fixtures
+
+PROVINCE = regions.GYEONGBUK
+SELECTED = "영천시"
+
+# app.py의 CHARTS와 같은 입력
+CHARTS = {
+    "radar": lambda table: radar.plot_radar_chart(metrics.radar_scores(table, PROVINCE), SELECTED),
+    "crime": lambda table: crime_rate.plot_crime_rate(metrics.indicator(table, "crime", PROVINCE), SELECTED),
+    "facility": lambda table: population_facility.plot_population_facility_ratio(metrics.indicator(table, "facility", PROVINCE), SELECTED),
+    "park": lambda table: park_area.plot_park_area(metrics.indicator(table, "park", PROVINCE), SELECTED),
+    "air": lambda table: air_pollution.plot_stacked_bar(metrics.pollutant_means(table, PROVINCE), SELECTED),
+    "accident": lambda table: traffic.plot_accident_data(metrics.indicator(table, "accident", PROVINCE), SELECTED),
+}
+
+
+class Build:
+    params = [1, 10, 100]
+    param_names = ["scale"]
+
+    def setup(self, scale):
+        self.table = metrics.build_metrics(*fixtures.data_files(fixtures.ensure(scale)))
+
+    def time_radar(self, scale):
+        CHARTS["radar"](self.table)
+
+    def time_crime(self, scale):
+        CHARTS["crime"](self.table)
+
+    def time_facility(self, scale):
+        CHARTS["facility"](self.table)
+
+    def time_park(self, scale):
+        CHARTS["park"](self.table)
+
+    def time_air(self, scale):
+        CHARTS["air"](self.table)
+
+    def time_accident(self, scale):
+        CHARTS["accident"](self.table)
+
+
+class Serialize:
+    params = [1, 10, 100]
+    param_names = ["scale"]
+
+    def setup(self, scale):
+        table = metrics.build_metrics(*fixtures.data_files(fixtures.ensure(scale)))
+        self.figures = {name: build(table) for name, build in CHARTS.items()}
+
+    def time_radar(self, scale):
+        payload.to_json(self.figures["radar"])
+
+    def time_crime(self, scale):
+        payload.to_json(self.figures["crime"])
+
+    def time_facility(self, scale):
+        payload.to_json(self.figures["facility"])
+
+    def time_park(self, scale):
+        payload.to_json(self.figures["park"])
+
+    def time_air(self, scale):
+        payload.to_json(self.figures["air"])
+
+    def time_accident(self, scale):
+        payload.to_json(self.figures["accident"])
+
+    def track_json_bytes(self, scale):
+        # 세션에 보내는 그래프 6개의 JSON 크기 합
+        return sum(len(payload.to_json(fig).encode("utf-8")) for fig in self.figures.values())
+
+    def track_plotly_json_bytes(self, scale):
+        # 비교용: 줄이기 전 (plotly 기본 to_json)
+        return sum(len(fig.to_json().encode("utf-8")) for fig in self.figures.values())
@@ -0,0 +1,77 @@
+# benchmarks/bench_load.py
+# 원본 파일 읽기: loader로 원본(xlsx/csv)을 직접 파싱하는 시간과 artifact(Arrow)에서 읽는 시간
+import os
+
+from plots import air_pollution, artifacts, crime_rate, park_area, population, population_facility, traffic
+
+from benchmarks import fixtures
+
+LOADERS = {
+    "park": park_area.load_park_data,
+    "accident": traffic.load_accident_data,
+    "facility": population_facility.load_facility_data,
+    "population": population.load_population,
+    "crime": crime_rate.load_crime_data,
+    "pollution": air_pollution.load_air_pollution_data,
+}
+
+
+class Source:
+    params = [1, 10, 100]
+    param_names = ["scale"]
+
+    def setup(self, scale):
+        self.paths = fixtures.ensure(scale)
+
+    def time_park(self, scale):
+        LOADERS["park"](self.paths["park"])
+
+    def time_accident(self, scale):
+        LOADERS["accident"](self.paths["accident"])
+
+    def time_facility(self, scale):
+        LOADERS["facility"](self.paths["facility"])
+
+    def time_population(self, scale):
+        LOADERS["population"](self.paths["population"])
+
+    def time_crime(self, scale):
+        LOADERS["crime"](self.paths["crime"])
+
+    def time_pollution(self, scale):
+        LOADERS["pollution"](self.paths["pollution"])
+
+    def track_source_bytes(self, scale):
+        return sum(os.path.getsize(self.paths[key]) for key in LOADERS)
+
+
+class Artifact:
+    # build-data 이후 실제 서비스가 읽는 경로 (pyarrow가 없으면 건너뜀)
+    params = [1, 10, 100]
+    param_names = ["scale"]
+
+    def setup(self, scale):
+        if artifacts.feather is None:
+            raise NotImplementedError("pyarrow 없음")
+        self.paths = fixtures.ensure(scale)
+        for key, loader in LOADERS.items():
+            if not artifacts.artifact_path(self.paths[key], loader):
+                artifacts.build(self.paths[key], loader)
+
+    def time_park(self, scale):
+        artifacts.read(self.paths["park"], LOADERS["park"])
+
+    def time_accident(self, scale):
+        artifacts.read(self.paths["accident"], LOADERS["accident"])
+
+    def time_facility(self, scale):
+        artifacts.read(self.paths["facility"], LOADERS["facility"])
+
+    def time_population(self, scale):
+        artifacts.read(self.paths["population"], LOADERS["population"])
+
+    def time_crime(self, scale):
+        artifacts.read(self.paths["crime"], LOADERS["crime"])
+
+    def time_pollution(self, scale):
+        artifacts.read(self.paths["pollution"], LOADERS["pollution"])
@@ -0,0 +1,37 @@
+# benchmarks/bench_map.py
+# 지도 생성: 경계 단순화·파일 저장, 라벨 위치 계산, 지도 HTML 전체 생성
+import os
+import shutil
+import tempfile
+
+from plots import map
+
+from benchmarks import fixtures
+
+
+class Map:
+    params = [1, 10, 100]
+    param_names = ["scale"]
+
+    def setup(self, scale):
+        self.geojson = fixtures.ensure(scale)["geojson"]
+        self.names, self.geoms = map._features(map.load_geojson(self.geojson))
+        self.www_dir = tempfile.mkdtemp(prefix="bench-map-")
+
+    def teardown(self, scale):
+        shutil.rmtree(self.www_dir, ignore_errors=True)
+
+    def time_load_geojson(self, scale):
+        map._features(map.load_geojson(self.geojson))
+
+    def time_label_points(self, scale):
+        map.label_points(self.geoms)
+
+    def time_build_geometry(self, scale):
+        map.build_geometry(self.names, self.geoms, self.www_dir)
+
+    def time_generate_interactive_map(self, scale):
+        map.generate_interactive_map(self.geojson, os.path.join(self.www_dir, "map.html"))
+
+    def track_html_bytes(self, scale):
+        return map.generate_interactive_map(self.geojson, os.path.join(self.www_dir, "map.html"))["html_bytes"]
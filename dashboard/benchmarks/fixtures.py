@@ -0,0 +1,41 @@
+# benchmarks/fixtures.py
+# 벤치마크용 합성 원본 (plots/synthetic.py) - 배율별 크기
+# - scale 1:   실제 원본 크기 (경상북도 22개 시군, 시설 3,000건, 범죄 중분류 38개, 4개 연도, 측정소 시군당 1개)
+# - scale 10:  전국 시군구(시설·공원·대기오염·경계) + 행 수 10배 (시설 건수, 범죄 중분류, 연도, 읍면동)
+# - scale 100: 전국 + 행 수 100배 (대기오염은 시군당 측정소 10개, 경계 한 변 꼭짓점 600개)
+# - 한 번 만든 파일은 <data>/build/bench/<scale>x/ 에 두고 재사용 (생성기 코드가 바뀌면 다시 만듦)
+import json
+import os
+
+from plots import artifacts, regions, synthetic
+from shared import data_dir
+
+FIXTURE_DIR = data_dir / "build" / "bench"
+STAMP_NAME = "fixtures.json"
+
+DATA_KEYS = synthetic.DATA_KEYS
+data_files = synthetic.data_files
+
+
+def spec(scale):
+    if scale == 1:
+        return synthetic.make_spec(len(regions.default().in_province(regions.GYEONGBUK)))
+    return synthetic.make_spec(None, rows=scale, stations=10 if scale >= 100 else 1,
+                               vertices=600 if scale >= 100 else 200)
+
+
+def ensure(scale, root=FIXTURE_DIR):
+    # scale배 합성 원본 → {이름: 경로} (이미 만든 것이 최신이면 그대로 사용)
+    directory = os.path.join(str(root), f"{scale}x")
+    stamp_path = os.path.join(directory, STAMP_NAME)
+    stamp = {"version": artifacts.file_sha256(synthetic.__file__)[:12], "scale": scale}
+    try:
+        with open(stamp_path, encoding="utf-8") as f:
+            fresh = json.load(f) == stamp
+    except (OSError, ValueError):
+        fresh = False
+    paths = synthetic.generate(directory, spec(scale), seed=scale, overwrite=not fresh)
+    if not fresh:
+        with open(stamp_path, "w", encoding="utf-8") as f:
+            json.dump(stamp, f)
+    return paths
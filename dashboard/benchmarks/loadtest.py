@@ -0,0 +1,262 @@
+# benchmarks/loadtest.py
+# 세션 부하 시험 - 브라우저 없이 Shiny 웹소켓 세션 N개를 열고 지역 클릭(selected_region 입력)을 보냄
+# - 서버: 이 컴퓨터에서 `uvicorn app:app`을 새 프로세스로 띄움 (--url을 주면 이미 떠 있는 서버 사용)
+# - 세션 시작: 그래프 6개가 모두 그려질 때까지 시간 (init)
+# - 클릭: 경상북도 시군 중 하나를 골라 선택 → Shiny가 그 클릭을 다 처리할 때까지(선택 지역 문구 + 위젯 강조 변경분) 시간
+#   강조 색이 바뀌지 않는 위젯(빈 그래프, 그 지표에 없는 지역)은 변경분을 보내지 않으므로 위젯 수는 기다리지 않고 받은 만큼 기록
+#   세션마다 초당 rate번 클릭 (응답이 늦으면 다음 클릭은 응답을 받은 뒤에 바로 보냄)
+# - 결과: init / 클릭 지연 p50·p95·p99, 처리량, 서버 CPU·RSS (/proc, worker 프로세스 포함)
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+import websockets
+
+from plots import regions
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PLOTS = ["plot_radar", "plot_crime", "plot_facility", "plot_park", "plot_air", "plot_accident"]
+OUTPUTS = PLOTS + ["selected_region_text"]
+PERCENTILES = (50, 95, 99)
+
+
+# ─── 서버 프로세스 ──────────────────────────────────────────────────
+def start_server(port, workers=1, env=None):
+    # uvicorn을 새 프로세스로 시작하고 /ready가 200이 될 때까지 기다림
+    cmd = [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1", "--port", str(port),
+           "--log-level", "warning"]
+    if workers > 1:
+        cmd += ["--workers", str(workers)]
+    proc = subprocess.Popen(cmd, cwd=APP_DIR, env={**os.environ, **(env or {})})
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"서버가 종료됨 (exit {proc.returncode})")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/ready", timeout=2) as response:
+                if response.status == 200:
+                    return proc
+        except OSError:
+            pass
+        time.sleep(0.25)
+    proc.terminate()
+    raise RuntimeError("서버 준비 시간 초과 (/ready)")
+
+
+def _children(pid):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(c) for c in f.read().split()]
+    except OSError:
+        return []
+
+
+def _process_tree(pid):
+    pids, stack = [], [pid]
+    while stack:
+        p = stack.pop()
+        pids.append(p)
+        stack.extend(_children(p))
+    return pids
+
+
+def _cpu_seconds(pid):
+    # /proc/<pid>/stat의 utime + stime (clock tick → 초)
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def _rss_bytes(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+class ProcessSampler:
+    # 서버 프로세스(와 worker)의 CPU 시간·RSS를 주기적으로 기록 (/proc가 없으면 기록하지 않음)
+    def __init__(self, pid, interval=0.5):
+        self.pid, self.interval = pid, interval
+        self.samples = []   # (시각, CPU 초 합계, RSS 합계)
+
+    def sample(self):
+        cpu = rss = 0
+        for p in _process_tree(self.pid):
+            try:
+                cpu += _cpu_seconds(p)
+                rss += _rss_bytes(p)
+            except OSError:
+                continue   # 그 사이 종료된 프로세스
+        self.samples.append((time.monotonic(), cpu, rss))
+
+    async def run(self):
+        if self.pid is None or not os.path.exists(f"/proc/{self.pid}"):
+            return
+        while True:
+            self.sample()
+            await asyncio.sleep(self.interval)
+
+    def summary(self):
+        if len(self.samples) < 2:
+            return None
+        (t0, cpu0, _), (t1, cpu1, _) = self.samples[0], self.samples[-1]
+        rss = [s[2] for s in self.samples]
+        return {"cpu_percent": 100 * (cpu1 - cpu0) / (t1 - t0), "rss_peak": max(rss), "rss_end": rss[-1]}
+
+
+# ─── 세션 메시지 (tests/test_selection.py와 공유) ────────────────────
+# Shiny는 클라이언트 메시지를 하나씩 처리하고, 한 메시지로 생긴 값·위젯 변경분을 모두 보낸 뒤에 다음 메시지를 읽음
+# → 클릭 바로 뒤에 tag를 붙인 요청(SYNC_METHOD)을 보내고 그 응답이 오면 클릭의 결과는 모두 받은 것
+#   (busy: idle은 값보다 먼저 오므로 끝 표시로 쓸 수 없음, 없는 메서드라 응답은 error지만 tag는 그대로 옴)
+SYNC_METHOD = "loadtest_sync"
+
+
+def init_message(province):
+    return json.dumps({"method": "init", "data": {
+        **{f".clientdata_output_{o}_hidden": False for o in OUTPUTS}, "province": province,
+    }})
+
+
+def click_messages(region, tag):
+    # 지역 선택 + 처리 완료 확인 요청
+    return [json.dumps({"method": "update", "data": {"selected_region": region}}),
+            json.dumps({"method": SYNC_METHOD, "tag": tag, "args": []})]
+
+
+def plot_values(message):
+    # 값이 도착한 그래프 출력 id
+    return {k for k, v in (message.get("values") or {}).items() if v is not None} & set(PLOTS)
+
+
+class ClickUpdate:
+    # 클릭 하나의 응답 메시지를 모음: feed(message)가 True면 끝 (text: 선택 지역 문구, widgets: 강조가 바뀐 위젯 comm id)
+    def __init__(self, tag):
+        self.tag = tag
+        self.text = False
+        self.widgets = set()
+
+    def feed(self, message):
+        self.text = self.text or "selected_region_text" in (message.get("values") or {})
+        payload = (message.get("custom") or {}).get("shinywidgets_comm_msg")
+        if payload:
+            content = json.loads(payload)["content"]
+            if content["data"].get("state", {}).get("_py2js_update"):
+                self.widgets.add(content["comm_id"])
+        response = message.get("response")
+        if response and response.get("tag") == self.tag:
+            if not self.text:
+                raise RuntimeError("클릭 뒤 선택 지역 문구가 오지 않음")
+            return True
+        return False
+
+
+# ─── 세션 ───────────────────────────────────────────────────────────
+async def _receive(ws, timeout):
+    return json.loads(await asyncio.wait_for(ws.recv(), timeout))
+
+
+async def _until_plots(ws, timeout):
+    # 그래프 6개 값이 모두 도착할 때까지 (값은 서버의 idle 메시지보다 늦게 올 수 있음)
+    seen = set()
+    while not seen >= set(PLOTS):
+        seen |= plot_values(await _receive(ws, timeout))
+
+
+async def _click(ws, region, tag, timeout):
+    update = ClickUpdate(tag)
+    for message in click_messages(region, tag):
+        await ws.send(message)
+    while not update.feed(await _receive(ws, timeout)):
+        pass
+    return update
+
+
+async def session(url, province, names, clicks, rate, stats, timeout, seed):
+    rng = random.Random(seed)
+    async with websockets.connect(url, max_size=None, open_timeout=timeout) as ws:
+        start = time.perf_counter()
+        await ws.send(init_message(province))
+        await _until_plots(ws, timeout)
+        stats["init"].append(time.perf_counter() - start)
+
+        interval = 1 / rate if rate else 0
+        await asyncio.sleep(rng.uniform(0, interval))   # 세션들의 클릭 시점을 흩어 놓음
+        current = None
+        for tag in range(clicks):
+            # 이미 선택된 지역을 다시 누르면 갱신할 것이 없으므로 다른 지역을 고름
+            current = rng.choice([name for name in names if name != current])
+            sent = time.perf_counter()
+            update = await _click(ws, current, tag, timeout)
+            elapsed = time.perf_counter() - sent
+            stats["click"].append(elapsed)
+            stats["widgets"].append(len(update.widgets))
+            await asyncio.sleep(max(0.0, interval - elapsed))
+
+
+async def _run(url, sessions, clicks, rate, province, pid, timeout, ramp):
+    names = [r.name for r in regions.default().in_province(province)]
+    stats = {"init": [], "click": [], "widgets": [], "errors": []}
+    sampler = ProcessSampler(pid)
+    sampler_task = asyncio.create_task(sampler.run())
+
+    async def one(i):
+        await asyncio.sleep(ramp * i / max(sessions, 1))   # ramp초 동안 나눠서 접속
+        try:
+            await session(url, province, names, clicks, rate, stats, timeout, seed=i)
+        except Exception as e:
+            stats["errors"].append(f"{type(e).__name__}: {e}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(sessions)))
+    elapsed = time.perf_counter() - start
+    sampler.sample()
+    sampler_task.cancel()
+    return stats, elapsed, sampler.summary()
+
+
+def _percentiles(values):
+    if not values:
+        return None
+    ms = np.asarray(values) * 1000
+    return {f"p{p}": float(np.percentile(ms, p)) for p in PERCENTILES} | {"max": float(ms.max()), "count": len(values)}
+
+
+def run(url, sessions=10, clicks=20, rate=1.0, province=regions.GYEONGBUK, pid=None, timeout=60, ramp=0.0):
+    # 부하 시험 실행 → 결과 dict (지연은 ms)
+    stats, elapsed, server = asyncio.run(_run(url, sessions, clicks, rate, province, pid, timeout, ramp))
+    return {
+        "sessions": sessions, "clicks_per_session": clicks, "rate": rate,
+        "seconds": elapsed,
+        "throughput": len(stats["click"]) / elapsed if elapsed else 0.0,
+        "init_ms": _percentiles(stats["init"]),
+        "click_ms": _percentiles(stats["click"]),
+        "widgets_per_click": float(np.mean(stats["widgets"])) if stats["widgets"] else None,
+        "errors": stats["errors"],
+        "server": server,
+    }
+
+
+def print_report(result):
+    print(f"세션 {result['sessions']}개 × 클릭 {result['clicks_per_session']}번 (세션당 초당 {result['rate']}번), "
+          f"{result['seconds']:.1f}s, 처리량 {result['throughput']:.1f} 클릭/s")
+    for key, label in (("init_ms", "세션 시작"), ("click_ms", "지역 클릭")):
+        p = result[key]
+        if p:
+            print(f"  {label:<6} p50 {p['p50']:8.1f}ms  p95 {p['p95']:8.1f}ms  p99 {p['p99']:8.1f}ms  "
+                  f"max {p['max']:8.1f}ms  ({p['count']}건)")
+    if result["widgets_per_click"] is not None:
+        print(f"  클릭당 강조가 바뀐 위젯 평균 {result['widgets_per_click']:.1f}개 (그래프 {len(PLOTS)}개 중)")
+    server = result["server"]
+    if server:
+        print(f"  서버   CPU {server['cpu_percent']:.0f}%  RSS 최대 {server['rss_peak'] / 2**20:.0f}MB "
+              f"(종료 시 {server['rss_end'] / 2**20:.0f}MB)")
+    if result["errors"]:
+        print(f"⚠️ 실패한 세션 {len(result['errors'])}개: {result['errors'][0]}")
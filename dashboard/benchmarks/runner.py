@@ -0,0 +1,137 @@
+# benchmarks/runner.py
+# asv 형식(클래스의 params / setup / time_* / track_*) 벤치마크를 의존성 없이 실행
+# - time_*: timeit으로 한 번 측정에 0.2초 이상 걸리도록 반복 횟수를 정하고, 그 측정을 repeat번 → min / median / mean (초)
+# - track_*: 반환값(바이트 수, 행 수 등)을 그대로 기록
+# - 결과는 benchmarks/results/<시각>-<커밋>.json 으로 저장, --compare로 이전 결과와 비교 (1.1배 넘게 차이 나면 표시)
+import importlib
+import json
+import os
+import pkgutil
+import platform
+import re
+import statistics
+import subprocess
+import time
+import timeit
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+THRESHOLD = 1.1
+
+
+def discover(pattern=None):
+    # bench_*.py 모듈의 벤치마크 클래스 → [(이름, 클래스, [메서드 이름])]
+    package = os.path.dirname(os.path.abspath(__file__))
+    found = []
+    for info in sorted(pkgutil.iter_modules([package]), key=lambda m: m.name):
+        if not info.name.startswith("bench_"):
+            continue
+        module = importlib.import_module(f"benchmarks.{info.name}")
+        for cls_name, cls in vars(module).items():
+            if not isinstance(cls, type) or cls.__module__ != module.__name__:
+                continue
+            methods = [
+                m for m in vars(cls)
+                if m.startswith(("time_", "track_"))
+                and (pattern is None or re.search(pattern, f"{info.name}.{cls_name}.{m}"))
+            ]
+            if methods:
+                found.append((f"{info.name}.{cls_name}", cls, methods))
+    return found
+
+
+def _measure(fn, repeat):
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    samples = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "min": min(samples), "median": statistics.median(samples), "mean": statistics.fmean(samples),
+        "number": number, "repeat": repeat,
+    }
+
+
+def run(scales=None, pattern=None, repeat=5, log=print):
+    # 벤치마크 실행 → {"이름[scale]": 결과}
+    results = {}
+    for name, cls, methods in discover(pattern):
+        for scale in cls.params:
+            if scales and scale not in scales:
+                continue
+            bench = cls()
+            try:
+                bench.setup(scale)
+            except NotImplementedError as e:
+                log(f"  건너뜀  {name}[{scale}]: {e}")
+                continue
+            try:
+                for method in methods:
+                    key = f"{name}.{method}[{scale}]"
+                    fn = getattr(bench, method)
+                    try:
+                        if method.startswith("time_"):
+                            results[key] = _measure(lambda: fn(scale), repeat)
+                            log(f"  {key:<62} {format_seconds(results[key]['median'])}")
+                        else:
+                            results[key] = {"value": fn(scale)}
+                            log(f"  {key:<62} {results[key]['value']:,}")
+                    except Exception as e:
+                        log(f"⚠️ 실패  {key}: {e}")
+            finally:
+                if hasattr(bench, "teardown"):
+                    bench.teardown(scale)
+    return results
+
+
+def _commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save(results, directory=RESULTS_DIR, prefix=""):
+    commit = _commit()
+    doc = {
+        "commit": commit,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": {"node": platform.node(), "python": platform.python_version(),
+                    "platform": platform.platform(), "cpus": os.cpu_count()},
+        "results": results,
+    }
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{prefix}{time.strftime('%Y%m%d-%H%M%S')}-{commit or 'nogit'}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(doc, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def compare(results, baseline_path, log=print):
+    # 이전 결과 대비 비율 (time_*는 median, track_*는 값) → 느려진 벤치마크 수
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    regressions = 0
+    for key, new in results.items():
+        old = baseline.get(key)
+        if old is None:
+            continue
+        before, after = (old.get("median"), new.get("median")) if "median" in new else (old.get("value"), new.get("value"))
+        if not before or after is None:
+            continue
+        ratio = after / before
+        mark = ""
+        if ratio > THRESHOLD:
+            mark = "▲ 느려짐" if "median" in new else "▲ 증가"
+            regressions += "median" in new
+        elif ratio < 1 / THRESHOLD:
+            mark = "▼ 빨라짐" if "median" in new else "▼ 감소"
+        shown = (format_seconds(before), format_seconds(after)) if "median" in new else (f"{before:,}", f"{after:,}")
+        log(f"  {key:<62} {shown[0]:>10} → {shown[1]:>10}  x{ratio:.2f} {mark}")
+    return regressions
+
+
+def format_seconds(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g}{unit}"
+    return f"{seconds / 1e-9:.3g}ns"
@@ -0,0 +1,190 @@
+# 대시보드 관리 명령어
+#   python dashboard/cli.py build-data       # data/ 원본 → data/build/*.arrow artifact 생성
+#   python dashboard/cli.py publish-metrics  # 지표 통합 테이블 계산 → data/build/metrics.<버전>.arrow (worker들이 공유)
+#   python dashboard/cli.py build-map        # GeoJSON → www/gyeongbuk_map.html + www/map/ 경계 geometry
+#   python dashboard/cli.py generate-data    # 원본과 같은 형식의 합성 데이터 → data/build/synthetic/ (DASHBOARD_DATA_DIR로 지정해 오프라인 실행)
+#   python dashboard/cli.py bench            # 합성 원본(1/10/100배)으로 읽기·분석·그래프·직렬화·지도 벤치마크
+#   python dashboard/cli.py loadtest         # 로컬 서버에 Shiny 세션 N개로 지역 클릭 부하 → 지연 p50/p95/p99, 서버 CPU·RSS
+import argparse
+import os
+import sys
+import time
+
+from plots import artifacts, map, metrics, regions, synthetic
+from shared import DATA_FILES, GEOJSON_FP, MAP_HTML_FP, SOURCES, data_dir
+
+
+def build_data(args):
+    failed = 0
+    for source_path, loader in SOURCES:
+        name = artifacts.artifact_name(source_path, loader)
+        if not os.path.exists(source_path):
+            print(f"⚠️ 건너뜀  {name}: 원본 파일 없음")
+            continue
+        if not args.force and artifacts.artifact_path(source_path, loader):
+            print(f"  최신  {name}")
+            continue
+        try:
+            entry = artifacts.build(source_path, loader)
+        except Exception as e:
+            failed += 1
+            print(f"⚠️ 실패  {name}: {e}")
+            continue
+        print(f"✅ 생성  {name}  rows={entry['rows']}  {entry['bytes'] / 1024:.0f}KB  {entry['seconds']:.2f}s")
+    return 1 if failed else 0
+
+
+def publish_metrics(args):
+    # 없는 원본은 그 지표만 빠진 채로 게시 (앱도 같은 테이블을 계산함), 원본이 하나도 없으면 게시하지 않음
+    missing = [path for path in DATA_FILES if not os.path.exists(path)]
+    for path in missing:
+        print(f"⚠️ 건너뜀  {os.path.basename(path)}: 원본 파일 없음")
+    if len(missing) == len(DATA_FILES):
+        return 0
+    start = time.perf_counter()
+    path = metrics.publish(*DATA_FILES)
+    print(f"✅ 게시  {os.path.basename(path)}  {os.path.getsize(path) / 1024:.0f}KB  {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+def build_map(args):
+    if not os.path.exists(GEOJSON_FP):
+        print(f"⚠️ 건너뜀  {os.path.basename(MAP_HTML_FP)}: 원본 파일 없음 ({os.path.basename(GEOJSON_FP)})")
+        return 0
+    start = time.perf_counter()
+    report = map.build_map(GEOJSON_FP, MAP_HTML_FP, force=args.force)
+    if report is None:
+        print(f"  최신  {os.path.basename(MAP_HTML_FP)}")
+        return 0
+    print(f"✅ 생성  {os.path.basename(MAP_HTML_FP)}  {time.perf_counter() - start:.2f}s")
+    map.print_report(report)
+    return 0
+
+
+def generate_data(args):
+    only = args.only.split(",") if args.only else None
+    unknown = sorted(set(only or []) - set(synthetic.FILE_NAMES))
+    if unknown:
+        print(f"⚠️ 알 수 없는 원본: {', '.join(unknown)} (가능: {', '.join(synthetic.FILE_NAMES)})")
+        return 1
+    try:
+        spec = synthetic.make_spec(args.regions, rows=args.rows, stations=args.stations, vertices=args.vertices)
+    except ValueError as e:
+        print(f"⚠️ {e}")
+        return 1
+
+    targets = []
+    for key, name in synthetic.FILE_NAMES.items():
+        if only is not None and key not in only:
+            continue
+        if os.path.exists(os.path.join(args.out, name)) and not args.force:
+            print(f"  있음  {name} (덮어쓰려면 --force)")
+        else:
+            targets.append(key)
+    if not targets:
+        return 0
+
+    start = time.perf_counter()
+    paths = synthetic.generate(args.out, spec, seed=args.seed, only=targets, overwrite=True)
+    print(f"✅ 생성  {args.out}  지역 {len(spec.regions)}개 (경상북도 {len(spec.gyeongbuk)}개)  "
+          f"행 배율 {spec.rows}  {time.perf_counter() - start:.2f}s")
+    for key in targets:
+        print(f"  {os.path.getsize(paths[key]) / 1024:>8.0f}KB  {os.path.basename(paths[key])}")
+    print(f"  실행: DASHBOARD_DATA_DIR={os.path.abspath(args.out)} shiny run app.py")
+    return 0
+
+
+def bench(args):
+    from benchmarks import runner  # 벤치마크 모듈은 이 명령에서만 import
+
+    scales = [int(s) for s in args.scales.split(",")] if args.scales else None
+    results = runner.run(scales=scales, pattern=args.filter, repeat=args.repeat)
+    path = runner.save(results)
+    print(f"✅ 저장  {os.path.relpath(path)}  ({len(results)}개)")
+    if args.compare:
+        print(f"비교 기준: {os.path.basename(args.compare)}")
+        if runner.compare(results, args.compare) and args.fail_on_regression:
+            return 1
+    return 0
+
+
+def loadtest(args):
+    from benchmarks import loadtest, runner
+
+    server = None
+    url, pid = args.url, args.pid
+    if url is None:
+        print(f"서버 시작: 127.0.0.1:{args.port} (worker {args.workers}개)")
+        server = loadtest.start_server(args.port, workers=args.workers)
+        url, pid = f"ws://127.0.0.1:{args.port}/websocket/", server.pid
+    try:
+        result = loadtest.run(url, sessions=args.sessions, clicks=args.clicks, rate=args.rate,
+                              province=args.province, pid=pid, timeout=args.timeout, ramp=args.ramp)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    loadtest.print_report(result)
+
+    path = runner.save({"loadtest": result}, prefix="loadtest-")
+    print(f"✅ 저장  {os.path.relpath(path)}")
+    p95 = (result["click_ms"] or {}).get("p95")
+    if result["errors"] or (args.max_p95 is not None and (p95 is None or p95 > args.max_p95)):
+        return 1
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="반려동물 친화 환경 대시보드 관리 명령어")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("build-data", help="원본 데이터를 컬럼형 artifact(Arrow IPC)로 변환")
+    p.add_argument("--force", action="store_true", help="최신 artifact도 다시 생성")
+    p.set_defaults(func=build_data)
+
+    p = sub.add_parser("build-map", help="GeoJSON으로 지도 HTML과 확대 단계별 경계 파일 생성 (최신이면 건너뜀)")
+    p.add_argument("--force", action="store_true", help="최신이어도 다시 생성")
+    p.set_defaults(func=build_map)
+
+    p = sub.add_parser("publish-metrics", help="지표 통합 테이블을 계산해 worker들이 공유할 Arrow 파일로 게시")
+    p.set_defaults(func=publish_metrics)
+
+    p = sub.add_parser("generate-data", help="원본과 같은 형식의 합성 데이터 생성 (오프라인 실행·부하 시험용)")
+    p.add_argument("--out", default=str(data_dir / "build" / "synthetic"), help="저장 폴더 (기본: data/build/synthetic)")
+    p.add_argument("--regions", type=int, help="지역 수 (경상북도 시군부터, 기본: 전국)")
+    p.add_argument("--rows", type=int, default=1, help="행 배율 - 시설 건수, 범죄 중분류, 연도, 읍면동 수 (기본 1)")
+    p.add_argument("--stations", type=int, default=1, help="시군당 대기오염 측정소 수 (기본 1)")
+    p.add_argument("--vertices", type=int, default=200, help="경계 한 변의 꼭짓점 수 (기본 200)")
+    p.add_argument("--seed", type=int, default=0, help="난수 seed (기본 0)")
+    p.add_argument("--only", help="만들 원본 (쉼표 구분: " + ",".join(synthetic.FILE_NAMES) + ")")
+    p.add_argument("--force", action="store_true", help="이미 있는 파일도 덮어씀")
+    p.set_defaults(func=generate_data)
+
+    p = sub.add_parser("loadtest", help="Shiny 세션 N개로 지역 클릭 부하 시험 (서버는 로컬에서 자동 시작)")
+    p.add_argument("--sessions", type=int, default=10, help="동시 세션 수 (기본 10)")
+    p.add_argument("--clicks", type=int, default=20, help="세션당 클릭 수 (기본 20)")
+    p.add_argument("--rate", type=float, default=1.0, help="세션당 초당 클릭 수 (기본 1, 0이면 응답 받자마자 다음 클릭)")
+    p.add_argument("--ramp", type=float, default=0.0, help="세션을 이 시간(초) 동안 나눠서 접속 (기본 0 = 동시에)")
+    p.add_argument("--province", default=regions.GYEONGBUK, help="시도 (기본 경상북도)")
+    p.add_argument("--workers", type=int, default=1, help="서버 worker 수 (기본 1)")
+    p.add_argument("--port", type=int, default=8765, help="서버 포트 (기본 8765)")
+    p.add_argument("--url", help="이미 떠 있는 서버의 웹소켓 주소 (예: ws://127.0.0.1:8000/websocket/)")
+    p.add_argument("--pid", type=int, help="--url 서버의 프로세스 id (CPU·RSS 측정용)")
+    p.add_argument("--timeout", type=float, default=60, help="응답 대기 한도 (초, 기본 60)")
+    p.add_argument("--max-p95", type=float, help="클릭 p95 지연 한도(ms) - 넘거나 실패한 세션이 있으면 종료 코드 1")
+    p.set_defaults(func=loadtest)
+
+    p = sub.add_parser("bench", help="합성 원본으로 벤치마크 실행 후 benchmarks/results/ 에 저장")
+    p.add_argument("--scales", help="데이터 배율 (쉼표 구분, 기본: 1,10,100 전부)")
+    p.add_argument("--filter", help="벤치마크 이름 정규식 (예: 'figures|map')")
+    p.add_argument("--repeat", type=int, default=5, help="측정 반복 횟수 (기본 5)")
+    p.add_argument("--compare", help="비교할 이전 결과 JSON 파일")
+    p.add_argument("--fail-on-regression", action="store_true", help="비교 결과 1.1배 넘게 느려진 항목이 있으면 종료 코드 1")
+    p.set_defaults(func=bench)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
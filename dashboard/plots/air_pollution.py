@@ -1,35 +1,69 @@
+import logging
+
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
+from plots import cache, regions, xlsx, instrument
+
+logger = logging.getLogger("dashboard.data")
+
+POLLUTANTS = {
+    'PM2.5': '미세먼지_PM2.5__월별_도시별_대기오염도',
+    'PM10': '미세먼지_PM10__월별_도시별_대기오염도',
+    'O3': '오존_월별_도시별_대기오염도',
+    'CO': '일산화탄소_월별_도시별_대기오염도',
+    'NO2': '이산화질소_월별_도시별_대기오염도'
+}
+
+def load_air_pollution_data(file_path: str) -> pd.DataFrame:
+    # 통합문서를 한 번만 열어 오염물질 시트 5개를 모두 읽고
+    # (province, region, pollutant, month, value) 형태의 long 데이터로 변환
+    sheets = xlsx.read_frames(file_path, list(POLLUTANTS.values()))
+    sheet_to_pollutant = {sheet: pollutant for pollutant, sheet in POLLUTANTS.items() if sheet in sheets}
+    for pollutant, sheet in POLLUTANTS.items():
+        if sheet not in sheets:
+            logger.warning("%s 시트 오류: '%s' 시트가 없습니다", pollutant, sheet)
+
+    frames = []
+    for sheet, df in sheets.items():
+        month_cols = [col for col in df.columns if str(col).replace('.', '').isdigit()]
+        long_df = df.melt(
+            id_vars=['구분(1)', '구분(2)'],
+            value_vars=month_cols,
+            var_name='month',
+            value_name='value'
+        )
+        long_df.insert(2, 'pollutant', sheet_to_pollutant[sheet])
+        frames.append(long_df)
+
+    data = pd.concat(frames, ignore_index=True)
+    data.columns = ['province', 'region', 'pollutant', 'month', 'value']
+    data['month'] = data['month'].astype(str)
+    data['value'] = pd.to_numeric(data['value'], errors='coerce')
+    return data
 
+def annual_means(data: pd.DataFrame, province: str = None) -> pd.DataFrame:
+    # (시도, 시군구) × 오염물질 연평균 (월별 평균 → 연평균, groupby 한 번으로 모든 시도·물질 계산)
+    if province is not None:
+        data = data[data['province'] == province]
+    data = data.assign(province=regions.normalize_province(data['province']))
+    data = data.assign(region=regions.normalize(data['region'], province=data['province']))
+    monthly = data.groupby(['province', 'region', 'pollutant', 'month'], observed=True)['value'].mean()
+    annual = monthly.groupby(level=['province', 'region', 'pollutant'], observed=True).mean().unstack('pollutant')
+    return annual.reindex(columns=[p for p in POLLUTANTS if p in annual.columns])
+
+@instrument.timed("analyze")
 def analyze_air_pollution_data(file_path: str) -> pd.DataFrame:
-    pollutants = {
-        'PM2.5': '미세먼지_PM2.5__월별_도시별_대기오염도',
-        'PM10': '미세먼지_PM10__월별_도시별_대기오염도',
-        'O3': '오존_월별_도시별_대기오염도',
-        'CO': '일산화탄소_월별_도시별_대기오염도',
-        'NO2': '이산화질소_월별_도시별_대기오염도'
-    }
-    
-    result_df = None
-
-    for pollutant, sheet_name in pollutants.items():
-        try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name)
-            gyeongbuk_df = df[df['구분(1)'] == '경상북도']
-            month_cols = [col for col in df.columns if str(col).replace('.', '').isdigit()]
-            avg_df = gyeongbuk_df.groupby('구분(2)')[month_cols].mean().mean(axis=1).reset_index()
-            avg_df.columns = ['시군구', f'{pollutant}_평균']
-            
-            if result_df is None:
-                result_df = avg_df
-            else:
-                result_df = pd.merge(result_df, avg_df, on='시군구', how='outer')
-        except Exception as e:
-            print(f"{pollutant} 시트 오류: {e}")
-    
+    data = cache.load_source(file_path, load_air_pollution_data)
+
+    result_df = annual_means(data)
+    result_df.columns = [f'{pollutant}_평균' for pollutant in result_df.columns]
+    result_df = result_df.rename_axis(['시도', '시군구']).reset_index()
+    result_df.columns.name = None
+
     return result_df
 
+@instrument.timed("plot")
 def plot_stacked_bar(df: pd.DataFrame, selected_region: str = "영천시") -> go.Figure:
     pollutant_cols = [col for col in df.columns if col != '시군구']
 
@@ -62,18 +96,12 @@ def plot_stacked_bar(df: pd.DataFrame, selected_region: str = "영천시") -> go
             f'5개 물질 총합: %{{customdata[2]:.3f}}<extra></extra>'
         )
 
-        opacity_list = [
-            1.0 if region == selected_region else 0.3
-            for region in sorted_data['시군구']
-        ]
-
         fig.add_trace(go.Bar(
             x=sorted_data['시군구'],
             y=sorted_data[col],
             name=pollutant_name,
             customdata=hover_data,
-            hovertemplate=hover_template,
-            marker=dict(opacity=opacity_list)
+            hovertemplate=hover_template
         ))
 
     # 🚨 핵심: 막대 수에 맞춰 그래프 전체 너비 줄이기
@@ -109,5 +137,11 @@ def plot_stacked_bar(df: pd.DataFrame, selected_region: str = "영천시") -> go
     )
 
 
+    return highlight_stacked_bar(fig, selected_region)
+
+def highlight_stacked_bar(fig: go.Figure, selected_region: str) -> go.Figure:
+    # 선택 지역 막대만 불투명하게 (trace는 그대로 두고 투명도 배열만 교체)
+    for trace in fig.data:
+        trace.marker.opacity = [1.0 if region == selected_region else 0.3 for region in trace.x]
     return fig
 
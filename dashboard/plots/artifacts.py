@@ -0,0 +1,146 @@
+# plots/artifacts.py
+# 원본 데이터(xlsx / cp949 csv) → 정규화된 컬럼형 artifact(Arrow IPC, 메모리 매핑 가능) 변환
+# - build(): 원본 파일을 loader로 읽어 <데이터 폴더>/build/ 아래에 .arrow 파일로 저장
+# - read(): artifact가 최신이면 메모리 매핑으로 바로 읽고, 아니면 원본 파일을 loader로 읽음
+# - manifest.json 에 원본 파일의 sha256 / 크기 / 수정시각과 loader 버전을 기록해 최신 여부 판단
+import hashlib
+import inspect
+import json
+import os
+import time
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow가 없으면 항상 원본 파일에서 읽음
+    pa = None
+    feather = None
+
+BUILD_DIR_NAME = "build"
+MANIFEST_NAME = "manifest.json"
+
+
+def build_dir(source_path):
+    return os.path.join(os.path.dirname(os.path.abspath(source_path)), BUILD_DIR_NAME)
+
+
+def artifact_name(source_path, loader):
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+    return f"{stem}.{loader.__name__}.arrow"
+
+
+def loader_version(loader):
+    # loader 코드가 바뀌면 기존 artifact는 자동으로 무효화
+    try:
+        code = inspect.getsource(loader)
+    except (OSError, TypeError):
+        code = f"{loader.__module__}.{loader.__qualname__}"
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()[:16]
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def read_manifest(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_atomic(path, data):
+    # 여러 worker가 동시에 빌드해도 반쯤 쓰인 파일이 서비스되지 않게 임시 파일 → 교체
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def write_manifest(directory, manifest):
+    data = json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True).encode("utf-8")
+    write_atomic(os.path.join(directory, MANIFEST_NAME), data)
+
+
+def source_entry(source_path):
+    # manifest에 남기는 원본 파일 정보 (source_matches로 비교)
+    st = os.stat(source_path)
+    return {
+        "source": os.path.basename(source_path),
+        "sha256": file_sha256(source_path),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+    }
+
+
+def source_matches(source_path, entry):
+    # manifest에 기록된 원본과 지금 파일이 같은지
+    st = os.stat(source_path)
+    if entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+        return True
+    # 수정시각만 바뀐 경우(복사/배포 등)에는 내용 해시로 다시 확인
+    return entry.get("size") == st.st_size and entry.get("sha256") == file_sha256(source_path)
+
+
+def is_fresh(source_path, loader, entry):
+    if not entry or entry.get("loader_version") != loader_version(loader):
+        return False
+    return source_matches(source_path, entry)
+
+
+def artifact_path(source_path, loader):
+    # 최신 artifact가 있으면 경로를, 없으면 None 반환
+    if feather is None:
+        return None
+    directory = build_dir(source_path)
+    name = artifact_name(source_path, loader)
+    entry = read_manifest(directory).get(name)
+    path = os.path.join(directory, name)
+    if os.path.exists(path) and is_fresh(source_path, loader, entry):
+        return path
+    return None
+
+
+def read(source_path, loader):
+    path = artifact_path(source_path, loader)
+    if path is None:
+        return loader(source_path)
+    return feather.read_table(path, memory_map=True).to_pandas()
+
+
+def build(source_path, loader):
+    if feather is None:
+        raise RuntimeError("artifact 생성에는 pyarrow가 필요합니다 (pip install pyarrow)")
+
+    directory = build_dir(source_path)
+    os.makedirs(directory, exist_ok=True)
+    name = artifact_name(source_path, loader)
+    path = os.path.join(directory, name)
+
+    start = time.perf_counter()
+    df = loader(source_path)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp = path + ".tmp"
+    feather.write_feather(table, tmp, compression="uncompressed")  # 무압축 → 메모리 매핑 시 복사 없음
+    os.replace(tmp, path)
+
+    entry = {
+        **source_entry(source_path),
+        "loader": f"{loader.__module__}.{loader.__qualname__}",
+        "loader_version": loader_version(loader),
+        "rows": table.num_rows,
+        "columns": table.column_names,
+        "bytes": os.path.getsize(path),
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    manifest = read_manifest(directory)
+    manifest[name] = entry
+    write_manifest(directory, manifest)
+
+    entry["seconds"] = time.perf_counter() - start
+    return entry
@@ -0,0 +1,76 @@
+# plots/cache.py
+# 프로세스 전체에서 공유하는 데이터셋 캐시
+# - 키: 파일 절대경로 + 읽기 함수 + 읽기 옵션
+# - 파일의 수정시각(mtime)/크기(size)가 바뀌면 자동으로 다시 읽음
+# - 같은 파일을 여러 세션이 동시에 요청해도 파싱은 한 번만 수행
+import os
+import threading
+
+from plots import artifacts
+
+_frames = {}                 # key -> ((mtime_ns, size), 데이터)
+_locks = {}                  # key -> 해당 키 전용 lock
+_registry_lock = threading.Lock()
+
+
+def _freeze(value):
+    # 읽기 옵션(list/dict)을 dict 키로 쓸 수 있게 변환
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _key_lock(key):
+    with _registry_lock:
+        return _locks.setdefault(key, threading.Lock())
+
+
+def _read_only(data):
+    # 캐시 원본은 절대 직접 넘기지 않고 얕은 복사본을 넘김
+    # (pandas 3부터 항상 켜진 Copy-on-Write 덕분에 호출 측에서 수정해도 캐시 원본은 그대로 유지 - requirements에 pandas>=3)
+    if isinstance(data, dict):
+        return {k: v.copy(deep=False) for k, v in data.items()}
+    return data.copy(deep=False)
+
+
+def load(path, reader, **kwargs):
+    path = os.path.abspath(path)
+    key = (path, f"{reader.__module__}.{reader.__qualname__}", _freeze(kwargs))
+    stamp = _stamp(path)
+
+    entry = _frames.get(key)
+    if entry is None or entry[0] != stamp:
+        with _key_lock(key):
+            # lock 대기 중 다른 세션이 이미 읽었을 수 있으므로 한 번 더 확인
+            entry = _frames.get(key)
+            if entry is None or entry[0] != stamp:
+                entry = (stamp, reader(path, **kwargs))
+                _frames[key] = entry
+
+    return _read_only(entry[1])
+
+
+def clear():
+    with _registry_lock:
+        _frames.clear()
+        _locks.clear()
+
+
+def info():
+    # 모니터링용: 현재 캐시에 올라간 파일 목록
+    return [
+        {"path": key[0], "reader": key[1], "mtime_ns": stamp[0], "size": stamp[1]}
+        for key, (stamp, _) in list(_frames.items())
+    ]
+
+
+def load_source(path, loader):
+    # 원본 파일 → 정규화 데이터프레임 (최신 artifact가 있으면 artifact에서 바로 읽음)
+    return load(path, artifacts.read, loader=loader)
@@ -1,53 +1,44 @@
-import pandas as pd
 import plotly.express as px
-from plots.utils import unify_and_filter_region
+from plots import cache, regions, population, xlsx, instrument
+from plots.utils import unify_and_filter_region, highlight_bar
 
+# 범죄 통계 원본은 시군별 컬럼만 있고 시도 컬럼이 없음 → 시도 고정
+CRIME_PROVINCE = regions.GYEONGBUK
+
+def load_crime_data(crime_file_path):
+    # 범죄대분류 / 범죄중분류 + 시군별 발생 건수 (원본 그대로)
+    return xlsx.read_frame(crime_file_path)
+
+@instrument.timed("analyze")
 def analyze_crime_rate(crime_file_path, population_file_path):
-    crime_df = pd.read_excel(crime_file_path)
+    crime_df = cache.load_source(crime_file_path, load_crime_data)
     region_columns = [col for col in crime_df.columns if col not in ['범죄대분류', '범죄중분류']]
     total_crimes = crime_df[region_columns].sum().reset_index()
     total_crimes.columns = ['시군구', '총범죄건수']
 
-    pop_raw = pd.read_excel(population_file_path, sheet_name="1-2. 읍면동별 인구 및 세대현황", header=[3,4])
-    pop_df = pop_raw[[("구분","Unnamed: 0_level_1"),("총계","총   계")]].copy()
-    pop_df.columns = ["region", "population"]
-    pop_df = unify_and_filter_region(pop_df, "region")
-
-    crime_data = total_crimes.copy()
-    crime_data['region'] = crime_data['시군구']
+    # 범죄 통계 컬럼(시군 이름)도 같은 지명 사전으로 정리 (원본은 경상북도 시군별 통계)
+    crime_data = unify_and_filter_region(total_crimes, '시군구', province=CRIME_PROVINCE)
 
-    merged = pd.merge(
-        crime_data[['region', '총범죄건수']],
-        pop_df,
-        on="region",
-        how="inner"
-    )
+    # 시군구 인구 (plots/population.py, 인구 자료가 있는 지역만 남음)
+    merged = population.attach(crime_data[['province', 'region', '총범죄건수']], population_file_path)
     merged["범죄율"] = merged["총범죄건수"] / merged["population"]
     merged = merged.sort_values("범죄율", ascending=False)
     return merged
 
+# df: metrics.indicator(table, 'crime') → region, raw(범죄 건수), population, per_capita(1인당 범죄율)
+@instrument.timed("plot")
 def plot_crime_rate(df, selected_region):
-    df = df.copy()
-
-    df["color"] = pd.Categorical(
-        ["highlight" if r == selected_region else "other" for r in df["region"]],
-        categories=["highlight", "other"]
-    )
+    df = df.sort_values("per_capita", ascending=False)
 
     fig = px.bar(
         df,
         x="region",
-        y="범죄율",
-        color="color",
-        color_discrete_map={
-            "highlight": "#2ca02c",
-            "other": "#dddddd"
-        },
+        y="per_capita",
         category_orders={"region": df["region"].tolist()},
-        custom_data=["총범죄건수", "population"],
+        custom_data=["raw", "population"],
         labels={
             "region": "",     # ✅ x축 제목 숨김
-            "범죄율": "1인당 범죄율"  # y축 제목은 필요하면 유지
+            "per_capita": "1인당 범죄율"  # y축 제목은 필요하면 유지
         }
     )
 
@@ -67,4 +58,4 @@ def plot_crime_rate(df, selected_region):
         hovertemplate='범죄 건수: %{customdata[0]}건<br>인구 수: %{customdata[1]}명<br>1인당 범죄 건수: %{y:.5f}<extra></extra>'
     )
 
-    return fig
+    return highlight_bar(fig, selected_region)
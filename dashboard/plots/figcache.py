@@ -0,0 +1,81 @@
+# plots/figcache.py
+# 직렬화된 그래프(JSON) LRU 캐시 - 프로세스 안의 모든 세션이 공유
+# - 키: (차트 id, 시도, 선택 지역, 데이터 버전)
+# - 같은 선택 상태의 그래프는 pandas/plotly 작업 없이 JSON에서 바로 복원
+# - 저장하는 JSON은 payload.to_json으로 줄인 형태 (template 정리, 작은 typed array)
+# - 같은 키를 여러 세션이 동시에 요청해도 그래프 생성은 한 번만 (키별 lock, plots/cache.py와 같은 방식)
+# - 최대 개수(FIGURE_CACHE_SIZE 환경변수, 기본 256)를 넘으면 가장 오래 안 쓴 항목부터 버림
+import os
+import threading
+from collections import OrderedDict
+
+from plots import instrument, payload
+
+MAX_ENTRIES = int(os.environ.get("FIGURE_CACHE_SIZE", "256"))
+
+_entries = OrderedDict()   # (chart_id, province, region, version) -> figure JSON
+_lock = threading.Lock()
+_locks = {}                # key -> 해당 키 전용 lock (그래프 생성 중복 방지)
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def _key_lock(key):
+    with _lock:
+        return _locks.setdefault(key, threading.Lock())
+
+
+def _lookup(key):
+    with _lock:
+        fig_json = _entries.get(key)
+        if fig_json is not None:
+            _entries.move_to_end(key)
+            _stats["hits"] += 1
+        return fig_json
+
+
+def get_json(chart_id, province, region, version, build):
+    key = (chart_id, province, region, version)
+    fig_json = _lookup(key)
+    if fig_json is not None:
+        return fig_json
+
+    # 그래프 생성은 전체 lock 밖, 키별 lock 안에서 (다른 차트 조회는 막지 않고 같은 그래프는 한 번만 생성)
+    with _key_lock(key):
+        # lock 대기 중 다른 세션이 이미 만들었을 수 있으므로 한 번 더 확인
+        fig_json = _lookup(key)
+        if fig_json is not None:
+            return fig_json
+        with _lock:
+            _stats["misses"] += 1
+
+        fig = build()
+        with instrument.span("serialize", chart_id) as span:
+            fig_json = payload.to_json(fig)
+            span.record(nbytes=len(fig_json.encode("utf-8")))
+
+        with _lock:
+            _entries[key] = fig_json
+            _entries.move_to_end(key)
+            while len(_entries) > MAX_ENTRIES:
+                evicted, _ = _entries.popitem(last=False)
+                _locks.pop(evicted, None)  # 버린 항목의 lock도 정리 (데이터 버전이 바뀌어도 lock이 쌓이지 않도록)
+                _stats["evictions"] += 1
+    return fig_json
+
+
+def as_widget(fig_json, esm=None):
+    # 캐시된 JSON → FigureWidget (위젯 생성은 세션의 이벤트 루프에서 해야 함)
+    # esm: 게시한 위젯 JS 번들을 불러오는 모듈 (payload.widget_esm) - 없으면 JS를 위젯마다 통째로 보냄
+    return payload.as_widget(fig_json, esm)
+
+
+def stats():
+    # 모니터링용 카운터
+    with _lock:
+        return {**_stats, "entries": len(_entries), "max_entries": MAX_ENTRIES}
+
+
+def clear():
+    with _lock:
+        _entries.clear()
+        _locks.clear()
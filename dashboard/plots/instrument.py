@@ -0,0 +1,189 @@
+# plots/instrument.py
+# 실행 시간 계측 - analyze_* / plot_* 호출, 그래프 직렬화, 세션의 그래프 render
+# - 호출마다 걸린 시간(wall), CPU 시간(그 스레드 기준), 처리한 행 수, 직렬화한 그래프 바이트 수를 히스토그램에 누적
+# - prometheus_text(): /metrics 응답 (Prometheus 텍스트 형식, 외부 라이브러리 없음)
+# - DASHBOARD_METRICS=0 이면 꺼짐: @timed는 원래 함수를 그대로 돌려주고 span()은 아무것도 하지 않는 객체 → 비용 거의 없음
+# - DASHBOARD_METRICS_LOG=1 이면 세션이 있는 구간(render)을 세션 id와 함께 JSON 한 줄로 로그
+# - 값은 worker 프로세스마다 따로 쌓임 → 모든 시계열에 worker(pid) label
+import bisect
+import functools
+import json
+import logging
+import os
+import threading
+import time
+
+ENABLED = os.environ.get("DASHBOARD_METRICS", "1") != "0"
+LOG_SESSIONS = ENABLED and os.environ.get("DASHBOARD_METRICS_LOG", "0") == "1"
+
+logger = logging.getLogger("dashboard.metrics")
+
+# 히스토그램 구간 상한 (Prometheus le)
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+ROWS_BUCKETS = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+BYTES_BUCKETS = (1_000, 5_000, 10_000, 25_000, 50_000, 100_000, 250_000, 1_000_000)
+
+# 이름 → (설명, 구간)
+HISTOGRAMS = {
+    "dashboard_call_seconds": ("호출 소요 시간 (wall)", SECONDS_BUCKETS),
+    "dashboard_call_cpu_seconds": ("호출 CPU 시간 (호출한 스레드 기준)", SECONDS_BUCKETS),
+    "dashboard_call_rows": ("호출이 처리한 행 수 (analyze_*: 결과, plot_*: 입력)", ROWS_BUCKETS),
+    "dashboard_figure_bytes": ("직렬화한 그래프 JSON 크기", BYTES_BUCKETS),
+}
+
+_series = {}   # (히스토그램 이름, kind, name) -> [구간별 개수..., 합계, 개수]
+_errors = {}   # (kind, name) -> 예외 횟수
+_lock = threading.Lock()
+
+
+def _observe(metric, kind, name, value):
+    buckets = HISTOGRAMS[metric][1]
+    key = (metric, kind, name)
+    with _lock:
+        series = _series.get(key)
+        if series is None:
+            series = _series[key] = [0] * (len(buckets) + 3)  # 구간들 + (+Inf) + 합계 + 개수
+        series[bisect.bisect_left(buckets, value)] += 1  # 마지막 구간 다음 칸 = +Inf
+        series[-2] += value
+        series[-1] += 1
+
+
+def _rows(value):
+    # DataFrame/Series/ndarray면 행 수, 아니면 None
+    shape = getattr(value, "shape", None)
+    return shape[0] if shape else None
+
+
+class Span:
+    # with instrument.span(kind, name) as span: ... span.record(rows=..., nbytes=...)
+    __slots__ = ("kind", "name", "session", "rows", "nbytes", "_wall", "_cpu")
+
+    def __init__(self, kind, name, session=None):
+        self.kind, self.name, self.session = kind, name, session
+        self.rows = self.nbytes = None
+
+    def record(self, rows=None, nbytes=None):
+        if rows is not None:
+            self.rows = rows
+        if nbytes is not None:
+            self.nbytes = nbytes
+
+    def __enter__(self):
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._wall
+        cpu = time.thread_time() - self._cpu
+        if exc_type is not None:
+            with _lock:
+                _errors[(self.kind, self.name)] = _errors.get((self.kind, self.name), 0) + 1
+        _observe("dashboard_call_seconds", self.kind, self.name, wall)
+        _observe("dashboard_call_cpu_seconds", self.kind, self.name, cpu)
+        if self.rows is not None:
+            _observe("dashboard_call_rows", self.kind, self.name, self.rows)
+        if self.nbytes is not None:
+            _observe("dashboard_figure_bytes", self.kind, self.name, self.nbytes)
+        if LOG_SESSIONS and self.session is not None:
+            logger.info(json.dumps({
+                "session": self.session, "kind": self.kind, "name": self.name,
+                "wall_ms": round(wall * 1000, 3), "cpu_ms": round(cpu * 1000, 3),
+                "rows": self.rows, "bytes": self.nbytes, "error": exc_type.__name__ if exc_type else None,
+            }, ensure_ascii=False))
+        return False
+
+
+class _NullSpan:
+    # 계측이 꺼져 있을 때 span() 대신 쓰는 객체 (아무것도 기록하지 않음)
+    __slots__ = ()
+
+    def record(self, rows=None, nbytes=None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(kind, name, session=None):
+    return Span(kind, name, session) if ENABLED else _NULL_SPAN
+
+
+def timed(kind):
+    # analyze_* / plot_* 계측 데코레이터 - 행 수는 DataFrame 결과(analyze_*), 아니면 첫 번째 인자(plot_*)에서
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+        name = fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with Span(kind, name) as s:
+                result = fn(*args, **kwargs)
+                rows = _rows(result)
+                s.record(rows=rows if rows is not None else (_rows(args[0]) if args else None))
+            return result
+        return wrapper
+    return decorate
+
+
+def reset():
+    with _lock:
+        _series.clear()
+        _errors.clear()
+
+
+def snapshot():
+    # 모니터링용: {(히스토그램, kind, name): {"count", "sum"}}
+    with _lock:
+        return {key: {"count": series[-1], "sum": series[-2]} for key, series in _series.items()}
+
+
+# ─── Prometheus 텍스트 형식 ─────────────────────────────────────────
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def prometheus_text(gauges=()):
+    # gauges: [(이름, 설명, 종류("gauge"/"counter"), [(label dict, 값), ...])] - 캐시 통계 등 호출 측에서 모은 값
+    worker = str(os.getpid())
+    with _lock:
+        series = {key: list(values) for key, values in _series.items()}
+        errors = dict(_errors)
+
+    lines = []
+    for metric, (help_text, buckets) in HISTOGRAMS.items():
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+        for (m, kind, name), values in sorted(series.items()):
+            if m != metric:
+                continue
+            cumulative = 0
+            for le, count in zip((*buckets, "+Inf"), values[:-2]):
+                cumulative += count
+                lines.append(f"{metric}_bucket{_labels(worker=worker, kind=kind, name=name, le=le)} {cumulative}")
+            lines.append(f"{metric}_sum{_labels(worker=worker, kind=kind, name=name)} {_number(values[-2])}")
+            lines.append(f"{metric}_count{_labels(worker=worker, kind=kind, name=name)} {values[-1]}")
+
+    lines += ["# HELP dashboard_call_errors_total 예외로 끝난 호출 수", "# TYPE dashboard_call_errors_total counter"]
+    for (kind, name), count in sorted(errors.items()):
+        lines.append(f"dashboard_call_errors_total{_labels(worker=worker, kind=kind, name=name)} {count}")
+
+    for metric, help_text, metric_type, samples in gauges:
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {metric_type}"]
+        for labels, value in samples:
+            lines.append(f"{metric}{_labels(worker=worker, **labels)} {_number(value)}")
+    return "\n".join(lines) + "\n"
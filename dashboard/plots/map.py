@@ -1,109 +1,324 @@
 import folium
+import gzip
+import hashlib
 import json
+import logging
+import os
+import re
+
 import numpy as np
+import shapely
 from shapely.geometry import shape
 from folium import Element
 
+from plots import artifacts
+
+logger = logging.getLogger("dashboard.map")
+
+# --- 경계 geometry 정적 파일 ---
+# GeoJSON 전체를 HTML에 넣지 않고, 확대 단계별로 단순화한 가벼운 파일을 www/map/ 에 따로 저장
+# - 인접한 시군이 경계를 공유하도록 coverage 단순화 (GEOS 3.12 미만이거나 경계가 어긋난 원본이면 시군별 단순화)
+# - 좌표는 그 확대 단계에서 화면상 0.1픽셀 정도까지만 남기고 반올림 (소수점 자릿수 ↓ → 파일 크기 ↓)
+# - 파일 이름에 내용 해시를 붙여 내용이 바뀌면 주소도 바뀜 (브라우저 캐시 무효화)
+GEOMETRY_DIR = "map"
+NAME_PROPERTY = "행정구역"
+
+# (이 확대 단계부터 사용, 단순화 기준 확대 단계) - 처음 화면(7.5)은 가장 거친 파일만 받음
+ZOOM_LEVELS = [(0, 8), (9, 10), (11, 12)]
+
+# www/map/manifest.json (artifacts.MANIFEST_NAME): 마지막 빌드의 GeoJSON 해시 + 생성 코드 버전 + 결과 파일
+
+
+def _degrees_per_pixel(zoom):
+    # 256px 타일 기준 1픽셀의 경도 폭
+    return 360 / (256 * 2 ** zoom)
+
+
+def _simplify(geoms, tolerance, coverage):
+    if coverage:
+        return shapely.coverage_simplify(geoms, tolerance)
+    return shapely.simplify(geoms, tolerance, preserve_topology=True)
+
+
+def _quantize(geoms, zoom):
+    digits = int(np.ceil(-np.log10(_degrees_per_pixel(zoom) / 10)))
+    return shapely.transform(geoms, lambda coords: np.round(coords, digits))
+
+
+def _feature_collection(names, geoms):
+    features = [
+        f'{{"type":"Feature","properties":{json.dumps({NAME_PROPERTY: name}, ensure_ascii=False, separators=(",", ":"))},'
+        f'"geometry":{shapely.to_geojson(geom)}}}'
+        for name, geom in zip(names, geoms)
+    ]
+    return '{"type":"FeatureCollection","features":[' + ",".join(features) + "]}"
+
+
+def _features(geojson_data):
+    # 이름과 geometry가 있는 feature만 → (이름 목록, shapely geometry 배열)
+    features = [
+        f for f in geojson_data["features"]
+        if f.get("geometry") and f["properties"].get(NAME_PROPERTY)
+    ]
+    names = [f["properties"][NAME_PROPERTY] for f in features]
+    geoms = np.array([shape(f["geometry"]) for f in features], dtype=object)
+    return names, geoms
+
+
+def label_points(geoms):
+    # 라벨 위치를 한 번에 계산: 무게중심이 영역 안에 있으면 무게중심, 밖이면(ㄷ자 모양 등) 영역 안의 점
+    centroids = shapely.centroid(geoms)
+    inside = shapely.contains(geoms, centroids)
+    points = np.where(inside, centroids, shapely.point_on_surface(geoms))
+    return shapely.get_coordinates(points)  # (경도, 위도) 배열
+
+
+def build_geometry(names, geoms, www_dir, stem="gyeongbuk"):
+    # 확대 단계별 geometry 파일 생성 → [{"min_zoom", "url", "bytes", "gzip_bytes"}, ...]
+    # 가장 세밀한 단계의 격자에 먼저 맞춤 → 부동소수점 오차로 어긋난 공유 경계 꼭짓점이 같아짐
+    geoms = _quantize(geoms, max(zoom for _, zoom in ZOOM_LEVELS))
+    coverage = hasattr(shapely, "coverage_simplify") and bool(shapely.coverage_is_valid(geoms))
+    if not coverage:
+        logger.warning("경계가 맞물리지 않는 원본 → 시군별 단순화 (인접 경계에 틈이 생길 수 있음)")
+
+    out_dir = os.path.join(www_dir, GEOMETRY_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+    levels, written = [], set()
+    for min_zoom, zoom in ZOOM_LEVELS:
+        simplified = _quantize(_simplify(geoms, _degrees_per_pixel(zoom) / 2, coverage), zoom)
+        data = _feature_collection(names, simplified).encode("utf-8")
+        name = f"{stem}.z{zoom}.{hashlib.sha256(data).hexdigest()[:10]}.json"
+        artifacts.write_atomic(os.path.join(out_dir, name), data)
+        written.add(name)
+        levels.append({
+            "min_zoom": min_zoom,
+            "url": f"{GEOMETRY_DIR}/{name}",
+            "bytes": len(data),
+            "gzip_bytes": len(gzip.compress(data)),
+        })
+
+    # 이전 빌드 파일 정리 - 완성된 geometry 파일 이름만 (다른 worker가 쓰는 중인 *.<pid>.tmp 파일은 건드리지 않음)
+    pattern = re.compile(rf"{re.escape(stem)}\.z\d+\.[0-9a-f]{{10}}\.json")
+    for name in os.listdir(out_dir):
+        if pattern.fullmatch(name) and name not in written:
+            try:
+                os.remove(os.path.join(out_dir, name))
+            except FileNotFoundError:
+                pass   # 다른 worker가 먼저 지움
+    return levels
+
+
 def generate_interactive_map(geojson_path, output_path):
+    # 지도 HTML + 확대 단계별 geometry 파일 생성 → 크기 보고서(dict) 반환
     with open(geojson_path, encoding="utf-8") as f:
         geojson_data = json.load(f)
 
+    names, geoms = _features(geojson_data)
+    levels = build_geometry(names, geoms, os.path.dirname(os.path.abspath(output_path)))
+
     m = folium.Map(location=[36.5, 128.8], zoom_start=7.5, tiles="cartodbpositron")
 
-    gj = folium.GeoJson(
-        geojson_data,
-        name="경북 시군",
-        style_function=lambda feature: {
-            "fillColor": "#a7c8f2",
-            "color": "#61738a",       # ✅ 테두리 색 연하게
-            "weight": 0.8,              # ✅ 테두리 두께 얇게
-            "opacity": 0.6,             # ✅ 테두리 투명도 낮추기
-            "fillOpacity": 0.6
-        },
-        highlight_function=lambda feature: {
-            "fillColor": "#5fa2e0",
-            "color": "black",
-            "weight": 3,
-            "fillOpacity": 0.8
-        }
+    # ✅ 처음 화면용 geometry는 HTML을 읽는 동안 미리 받기
+    m.get_root().header.add_child(Element(
+        f'<link rel="preload" href="{levels[0]["url"]}" as="fetch" crossorigin="anonymous">'
+    ))
+
+    # ✅ 시군 이름 라벨: 스타일은 CSS 클래스 하나로, 위치는 [이름, 위도, 경도] 목록으로만 HTML에 넣음
+    m.get_root().header.add_child(Element("""
+    <style>
+    .region-label {
+        display: inline-block;
+        font-size: 11px;
+        font-weight: bold;
+        color: black;
+        background-color: rgba(255, 255, 255, 0.3);
+        padding: 2px 6px;
+        border-radius: 4px;
+        white-space: nowrap;
+        text-align: center;
+        transform: translate(-50%, -50%);
+        box-shadow: 1px 1px 3px rgba(0,0,0,0.1);
+    }
+    </style>
+    """))
+    labels = json.dumps(
+        # 라벨이 경계선·중심에 겹치지 않게 살짝 오른쪽 아래로
+        [[name, round(lat - 0.015, 5), round(lon + 0.02, 5)] for name, (lon, lat) in zip(names, label_points(geoms))],
+        ensure_ascii=False, separators=(",", ":"),
     )
-    gj.add_to(m)
-
-    # ✅ 중심에 시군 이름 라벨 추가 (shapely 사용)
-    for feature in geojson_data['features']:
-        name = feature['properties'].get('행정구역', None)
-        geometry = feature['geometry']
-
-        if not name or not geometry:
-            continue
-
-        try:
-            geom = shape(geometry)
-            centroid = geom.centroid
-            folium.Marker(
-                location=[centroid.y - 0.015, centroid.x + 0.02],
-                icon=folium.DivIcon(html=f'''
-                    <div style="
-                        display: inline-block;
-                        font-size: 11px;
-                        font-weight: bold;
-                        color: black;
-                        background-color: rgba(255, 255, 255, 0.3);
-                        padding: 2px 6px;
-                        border-radius: 4px;
-                        white-space: nowrap;
-                        text-align: center;
-                        transform: translate(-50%, -50%);
-                        box-shadow: 1px 1px 3px rgba(0,0,0,0.1);
-                    ">
-                        {name}
-                    </div>
-                ''')
-            ).add_to(m)
-        except Exception as e:
-            print(f"⚠️ {name} 중심좌표 라벨 실패: {e}")
-
-    # ✅ 클릭 이벤트 처리
+
+    # ✅ 경계 레이어: 확대 단계에 맞는 geometry 파일을 받아서 그림 + 클릭 이벤트 처리
+    config = json.dumps([{"minZoom": level["min_zoom"], "url": level["url"]} for level in levels])
     js = Element("""
     <script>
     document.addEventListener("DOMContentLoaded", function() {
-        let map;
-        for (let key in window) {
-            if (window[key] instanceof L.Map) {
-                map = window[key];
-                break;
+        const map = %(map)s;
+        const levels = %(levels)s;
+        const style = {
+            fillColor: "#a7c8f2",
+            color: "#61738a",       // ✅ 테두리 색 연하게
+            weight: 0.8,            // ✅ 테두리 두께 얇게
+            opacity: 0.6,           // ✅ 테두리 투명도 낮추기
+            fillOpacity: 0.6
+        };
+        const highlight = {fillColor: "#5fa2e0", color: "black", weight: 3, fillOpacity: 0.8};
+        const selectedStyle = {color: "black", weight: 2.5, opacity: 1, fillOpacity: 0.85};
+        const palette = ["#eef4fb", "#c6dbef", "#9ecae1", "#6baed6", "#3182bd", "#08519c"];  // 점수 낮음 → 높음
+        const requests = {};
+        let layer = null;
+        let current = null;
+
+        // ─── 대시보드(부모 페이지)와 주고받는 메시지 ───
+        //   지도 → 부모: {type: "ready"}, {type: "select", region}
+        //   부모 → 지도: {type: "map_scores", label, scores: {시군구: 0~1}}, {type: "map_selected", region}
+        // 받은 상태로 이 페이지 안에서 색만 다시 칠함 (지도 HTML을 다시 만들거나 받지 않음)
+        const state = {label: "", scores: {}, selected: null};
+
+        function post(message) {
+            if (window.parent !== window) window.parent.postMessage(message, window.location.origin);
+        }
+
+        function styleFor(feature) {
+            const region = feature.properties["%(name)s"];
+            const score = state.scores[region];
+            const s = Object.assign({}, style);
+            if (score !== undefined && score !== null) {
+                s.fillColor = palette[Math.min(palette.length - 1, Math.floor(score * palette.length))];
             }
+            if (region === state.selected) Object.assign(s, selectedStyle);
+            return s;
         }
 
-        if (!map) {
-            console.log("❌ Leaflet map 객체를 찾을 수 없습니다.");
-            return;
+        function restyle() {
+            if (layer) layer.setStyle(styleFor);
         }
 
-        map.eachLayer(function(layer) {
-            if (layer.feature && layer.feature.properties && layer.feature.properties["행정구역"]) {
-                layer.on('click', function(e) {
-                    const region = layer.feature.properties["행정구역"];
-                    console.log("✅ JS 클릭된 지역:", region);
-                    if (region && window.parent) {
-                        window.parent.postMessage(region, '*');
-                    }
-                });
+        window.addEventListener("message", function(event) {
+            if (event.source !== window.parent || !event.data) return;
+            if (event.data.type === "map_scores") {
+                state.label = event.data.label || "";
+                state.scores = event.data.scores || {};
+                restyle();
+            } else if (event.data.type === "map_selected") {
+                state.selected = event.data.region || null;
+                restyle();
             }
         });
+
+        function levelFor(zoom) {
+            let pick = levels[0];
+            for (const level of levels) {
+                if (zoom >= level.minZoom) pick = level;
+            }
+            return pick;
+        }
+
+        function onEachFeature(feature, featureLayer) {
+            const region = feature.properties["%(name)s"];
+            featureLayer.bindTooltip(function() {
+                const score = state.scores[region];
+                return score === undefined || score === null ? region : region + " · " + state.label + " " + Math.round(score * 100);
+            }, {sticky: true});
+            featureLayer.on({
+                mouseover: function(e) { e.target.setStyle(highlight); e.target.bringToFront(); },
+                mouseout: function(e) { if (layer) layer.resetStyle(e.target); },
+                click: function() {
+                    console.log("✅ JS 클릭된 지역:", region);
+                    state.selected = region;  // 서버 응답을 기다리지 않고 바로 강조
+                    restyle();
+                    post({type: "select", region: region});
+                }
+            });
+        }
+
+        function show(level) {
+            if (current === level) return;
+            current = level;
+            requests[level.url] = requests[level.url] || fetch(level.url).then(function(r) { return r.json(); });
+            requests[level.url].then(function(data) {
+                if (current !== level) return;  // 받는 동안 확대 단계가 또 바뀜
+                const first = layer === null;
+                const next = L.geoJSON(data, {style: styleFor, onEachFeature: onEachFeature}).addTo(map);
+                if (layer) map.removeLayer(layer);
+                layer = next;
+                if (first) post({type: "ready"});  // 부모가 마지막 상태를 다시 보내 줌
+            });
+        }
+
+        show(levelFor(map.getZoom()));
+        map.on("zoomend", function() { show(levelFor(map.getZoom())); });
+
+        // 라벨 레이어 하나에 모든 시군 이름
+        const labels = L.layerGroup();
+        for (const [name, lat, lng] of %(labels)s) {
+            const div = document.createElement("div");
+            div.className = "region-label";
+            div.textContent = name;
+            L.marker([lat, lng], {icon: L.divIcon({className: "", html: div}), interactive: false}).addTo(labels);
+        }
+        labels.addTo(map);
     });
     </script>
-    """)
+    """ % {"map": m.get_name(), "levels": config, "name": NAME_PROPERTY, "labels": labels})
 
     m.get_root().html.add_child(js)
-    m.save(output_path)
+    artifacts.write_atomic(output_path, m.get_root().render().encode("utf-8"))
+
+    return {
+        "geojson_bytes": len(json.dumps(geojson_data, ensure_ascii=False).encode("utf-8")),  # 예전에는 이만큼이 HTML에 포함
+        "html_bytes": os.path.getsize(output_path),
+        "levels": levels,
+    }
+
+# --- 빌드 캐시 ---
+# GeoJSON 내용 해시 + 생성 코드 버전이 마지막 빌드와 같고 결과 파일이 모두 있으면 다시 만들지 않음
+# (파일 존재 여부만 보면 GeoJSON이 바뀌어도 예전 경계가 계속 서비스됨)
+def generator_version():
+    functions = [generate_interactive_map, build_geometry, _simplify, _quantize, _feature_collection]
+    code = "".join(artifacts.loader_version(f) for f in functions) + repr(ZOOM_LEVELS)
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()[:16]
+
+
+def _manifest_dir(output_path):
+    return os.path.join(os.path.dirname(os.path.abspath(output_path)), GEOMETRY_DIR)
+
+
+def is_current(geojson_path, output_path):
+    manifest = artifacts.read_manifest(_manifest_dir(output_path))
+    if manifest.get("generator_version") != generator_version():
+        return False
+    www_dir = os.path.dirname(os.path.abspath(output_path))
+    outputs = [output_path] + [os.path.join(www_dir, level["url"]) for level in manifest.get("levels", [])]
+    if not all(os.path.exists(path) for path in outputs):
+        return False
+    return artifacts.source_matches(geojson_path, manifest)
+
+
+def build_map(geojson_path, output_path, force=False):
+    # 빌드가 최신이면 None, 새로 만들었으면 크기 보고서 반환
+    if not force and is_current(geojson_path, output_path):
+        return None
+    report = generate_interactive_map(geojson_path, output_path)
+    manifest = {
+        **artifacts.source_entry(geojson_path),
+        "generator_version": generator_version(),
+        "html": os.path.basename(output_path),
+        **report,
+    }
+    artifacts.write_manifest(_manifest_dir(output_path), manifest)
+    return report
 
 def load_geojson(path):
     with open(path, encoding="utf-8") as f:
         return json.load(f)
-    
+
+def print_report(report):
+    print(f"원본 GeoJSON(예전 HTML 포함분) {report['geojson_bytes'] / 1024:.0f}KB / 지도 HTML {report['html_bytes'] / 1024:.0f}KB")
+    for level in report["levels"]:
+        print(f"  z{level['min_zoom']:>2}~  {level['url']}  {level['bytes'] / 1024:.0f}KB (gzip {level['gzip_bytes'] / 1024:.0f}KB)")
+
 if __name__ == "__main__":
-    generate_interactive_map(
+    print_report(generate_interactive_map(
         geojson_path="/Users/jeongeunju/Desktop/with-pets/dashboard/data/gyeongbuk_polygon_4326.geojson",
         output_path="/Users/jeongeunju/Desktop/with-pets/dashboard/www/gyeongbuk_map.html"
-    )
+    ))
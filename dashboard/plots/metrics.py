@@ -0,0 +1,248 @@
+# plots/metrics.py
+# 시군구 × 지표 통합 테이블
+# - 각 모듈의 analyze_* 결과를 한 번만 계산해 (province, region, indicator, raw, population, per_capita, score) 형태로 합침
+# - 전국 시도를 한 테이블에 담고, 점수는 시도 안에서 정규화 → 시도 선택은 테이블을 자르기만 함
+# - 레이더 차트와 모든 막대 그래프가 이 테이블의 일부분만 잘라서 사용 → 두 차트의 수치가 항상 일치
+# - 데이터 버전(원본 파일 경로 + 수정시각 + 크기 + 분석 코드)이 같으면 프로세스 전체에서 한 번만 계산
+# - 지표는 하나씩 따로 계산: 원본 파일이 없거나 읽기에 실패한 지표는 로그를 남기고 빠짐 (나머지 차트는 그대로 표시)
+# - publish(): 계산한 테이블을 <데이터 폴더>/build/metrics.<버전>.arrow 로 저장
+#   → 여러 worker가 원본을 읽거나 분석하지 않고 같은 파일을 메모리 매핑으로 공유 (숫자 컬럼은 복사 없음)
+import glob
+import hashlib
+import logging
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from plots import artifacts, crime_rate, population_facility, park_area, traffic, air_pollution, regions, instrument
+
+# 레이더 차트 축 순서 = 아래 순서
+INDICATORS = {
+    'park':     {'label': '산책 환경',    'higher_is_better': True},
+    'facility': {'label': '반려동물 시설', 'higher_is_better': True},
+    'accident': {'label': '교통 안전',    'higher_is_better': False},
+    'crime':    {'label': '치안',        'higher_is_better': False},
+    'air':      {'label': '대기 환경',    'higher_is_better': False},
+}
+
+COLUMNS = ['province', 'region', 'indicator', 'raw', 'population', 'per_capita', 'score']
+KEY_COLUMNS = ['province', 'region', 'indicator']
+
+PUBLISHED_PREFIX = "metrics."
+
+logger = logging.getLogger("dashboard.data")
+
+_tables = {}
+_lock = threading.Lock()
+
+
+def data_version(*paths):
+    # 원본 파일들의 (경로, 수정시각, 크기)로 만든 짧은 해시 (없는 파일은 건너뜀 → 나중에 생기면 버전이 바뀜)
+    h = hashlib.sha256()
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        h.update(f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}\n".encode("utf-8"))
+    return h.hexdigest()[:12]
+
+
+def code_version():
+    # 분석 코드가 바뀌면 게시된 테이블도 무효화 (artifact와 같은 방식의 소스 해시)
+    functions = [
+        build_metrics, _air_frames, _indicator_frames, _frame, _score,
+        park_area.analyze_park_area, population_facility.analyze_population_facility_ratio,
+        traffic.analyze_accident_data, crime_rate.analyze_crime_rate, air_pollution.analyze_air_pollution_data,
+    ]
+    return "".join(artifacts.loader_version(f) for f in functions)
+
+
+def _frame(df, indicator, province, region, raw, population=None, per_capita=None):
+    # 모듈별 분석 결과 컬럼명을 공통 컬럼명으로 변환
+    out = pd.DataFrame({
+        'province': df[province].to_numpy(dtype=object),
+        'region': df[region].to_numpy(dtype=object),
+        'indicator': indicator,
+        'raw': df[raw].to_numpy(dtype=float),
+        'population': df[population].to_numpy(dtype=float) if population else float('nan'),
+        'per_capita': df[per_capita].to_numpy(dtype=float) if per_capita else float('nan'),
+    })
+    return out
+
+
+def _score(table):
+    # 시도 × 지표별 0~1 점수 (1 = 그 시도에서 가장 좋음)
+    # 값이 클수록 좋은 지표는 값/최댓값, 작을수록 좋은 지표는 역수/역수의 최댓값
+    base = table['per_capita'].fillna(table['raw'])
+    higher = table['indicator'].map({k: v['higher_is_better'] for k, v in INDICATORS.items()})
+    base = base.where(higher.fillna(True).astype(bool), 1 / base)
+    score = base / base.groupby([table['province'], table['indicator']]).transform('max')
+    return score.where(table['indicator'].isin(list(INDICATORS)))
+
+
+def _air_frames(pollution_fp):
+    # 대기오염: 물질별 연평균(raw)은 그대로 두고, 시도 안에서 최댓값 대비 정규화한 수치의 합을 종합 지표(air)로 사용
+    air = air_pollution.analyze_air_pollution_data(pollution_fp)
+    pollutant_cols = [col for col in air.columns if col not in ('시도', '시군구')]
+    normalized = air[pollutant_cols] / air.groupby('시도', observed=True)[pollutant_cols].transform('max')
+    frames = [_frame(air, col.split('_')[0], '시도', '시군구', col) for col in pollutant_cols]
+    air['종합'] = normalized.sum(axis=1)
+    frames.append(_frame(air, 'air', '시도', '시군구', '종합'))
+    return frames
+
+
+def _indicator_frames(name, paths, build):
+    # 지표 하나 계산 - 원본이 없거나 실패하면 로그만 남기고 빈 목록
+    missing = [path for path in paths if not os.path.exists(path)]
+    if missing:
+        logger.warning("지표 %s 건너뜀: 원본 없음 %s", name, ", ".join(missing))
+        return []
+    try:
+        return build()
+    except Exception:
+        logger.exception("지표 %s 건너뜀: 계산 실패", name)
+        return []
+
+
+@instrument.timed("analyze")
+def build_metrics(park_fp, acc_fp, facility_fp, pop_fp, crime_fp, pollution_fp):
+    builders = [
+        ('park', (park_fp, pop_fp), lambda: [_frame(park_area.analyze_park_area(park_fp, pop_fp),
+                                                    'park', '시도', '시군', '면적', '인구수', '공원면적비율')]),
+        ('facility', (facility_fp, pop_fp), lambda: [_frame(population_facility.analyze_population_facility_ratio(facility_fp, pop_fp),
+                                                            'facility', 'province', 'region', 'facility_count', 'population', 'per_person')]),
+        ('accident', (acc_fp, pop_fp), lambda: [_frame(traffic.analyze_accident_data(acc_fp, pop_fp),
+                                                       'accident', '시도', '시군', '평균사고건수', '인구수', '사고비율')]),
+        ('crime', (crime_fp, pop_fp), lambda: [_frame(crime_rate.analyze_crime_rate(crime_fp, pop_fp),
+                                                      'crime', 'province', 'region', '총범죄건수', 'population', '범죄율')]),
+        ('air', (pollution_fp,), lambda: _air_frames(pollution_fp)),
+    ]
+    frames = [frame for name, paths, build in builders for frame in _indicator_frames(name, paths, build)]
+    if not frames:
+        return pd.DataFrame(columns=COLUMNS)
+
+    table = pd.concat(frames, ignore_index=True)
+    table['score'] = _score(table)
+    return table[COLUMNS]
+
+
+def metrics_version(park_fp, acc_fp, facility_fp, pop_fp, crime_fp, pollution_fp):
+    paths = (park_fp, acc_fp, facility_fp, pop_fp, crime_fp, pollution_fp)
+    gazetteer = regions.default().path  # 지역 목록이 바뀌어도 다시 계산
+    version = data_version(*paths, *([gazetteer] if gazetteer else []))
+    return hashlib.sha256(f"{version}|{code_version()}".encode("utf-8")).hexdigest()[:12]
+
+
+def get_metrics(park_fp, acc_fp, facility_fp, pop_fp, crime_fp, pollution_fp):
+    paths = (park_fp, acc_fp, facility_fp, pop_fp, crime_fp, pollution_fp)
+    version = metrics_version(*paths)
+    with _lock:
+        table = _tables.get(version)
+        if table is None:
+            # 게시된 테이블이 있으면 원본을 읽지 않고 메모리 매핑, 없으면 직접 계산
+            path = _published_path(pop_fp, version)
+            table = read_published(path) if path else build_metrics(*paths)
+            table.attrs['data_version'] = version  # 그래프 캐시 키 등에 사용
+            _tables.clear()  # 이전 버전은 버림
+            _tables[version] = table
+    return table.copy(deep=False)
+
+
+# ─── 여러 worker가 공유하는 게시 테이블 ─────────────────────────────
+# 파일 이름에 버전이 들어가므로 원본이나 코드가 바뀌면 예전 파일은 자동으로 쓰이지 않음
+def _published_file(pop_fp, version):
+    return os.path.join(artifacts.build_dir(pop_fp), f"{PUBLISHED_PREFIX}{version}.arrow")
+
+
+def _published_path(pop_fp, version):
+    # 해당 버전의 게시 테이블 경로 (없거나 pyarrow가 없으면 None)
+    path = _published_file(pop_fp, version)
+    return path if artifacts.feather is not None and os.path.exists(path) else None
+
+
+def published(park_fp, acc_fp, facility_fp, pop_fp, crime_fp, pollution_fp):
+    # 현재 원본·코드에 맞는 게시 테이블이 있으면 그 경로
+    return _published_path(pop_fp, metrics_version(park_fp, acc_fp, facility_fp, pop_fp, crime_fp, pollution_fp))
+
+
+def publish(park_fp, acc_fp, facility_fp, pop_fp, crime_fp, pollution_fp):
+    # 통합 테이블을 계산(또는 캐시에서 꺼내)서 무압축 Arrow 파일로 저장 → 경로 반환
+    if artifacts.feather is None:
+        raise RuntimeError("테이블 게시에는 pyarrow가 필요합니다 (pip install pyarrow)")
+    table = get_metrics(park_fp, acc_fp, facility_fp, pop_fp, crime_fp, pollution_fp)
+    version = table.attrs['data_version']
+    path = _published_file(pop_fp, version)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # 숫자 컬럼은 NaN을 null로 바꾸지 않고 그대로 저장 → 읽을 때 numpy 배열이 파일을 직접 가리킴
+    pa = artifacts.pa
+    columns = {col: pa.array(table[col], type=pa.string()) for col in KEY_COLUMNS}
+    for col in COLUMNS:
+        if col not in KEY_COLUMNS:
+            columns[col] = pa.array(table[col].to_numpy(dtype=np.float64), from_pandas=False)
+    tmp = path + ".tmp"
+    artifacts.feather.write_feather(pa.table(columns), tmp, compression="uncompressed")
+    os.replace(tmp, path)
+
+    # 이전 버전 파일 정리 (이미 매핑해 둔 worker는 파일이 지워져도 계속 읽을 수 있음)
+    for old in glob.glob(os.path.join(os.path.dirname(path), f"{PUBLISHED_PREFIX}*.arrow")):
+        if old != path:
+            os.remove(old)
+    return path
+
+
+def read_published(path):
+    # 메모리 매핑 → 숫자 컬럼은 복사 없이 파일을 직접 가리킴 (split_blocks: 컬럼을 하나의 블록으로 합치며 복사하지 않음)
+    df = artifacts.feather.read_table(path, memory_map=True).to_pandas(split_blocks=True)
+    return df[COLUMNS]
+
+
+# ─── 차트별 조회 함수 ───────────────────────────────────────────────
+# province를 주면 그 시도만 잘라서 사용 (차트는 한 시도 기준)
+def _slice(table, province):
+    return table if province is None else table[table['province'] == province]
+
+
+def provinces(table):
+    # 시도 선택 목록: 모든 지표가 있는 시군구가 하나라도 있는 시도 (지명 사전 순서)
+    df = table[table['indicator'].isin(list(INDICATORS))]
+    counts = df.groupby(['province', 'region'])['indicator'].nunique()
+    complete = set(counts[counts == len(INDICATORS)].index.get_level_values('province'))
+    return [p for p in regions.provinces() if p in complete]
+
+
+def indicator(table, name, province=None):
+    # 막대 그래프용: 한 지표의 (region, raw, population, per_capita, score)
+    df = _slice(table, province)
+    df = df[df['indicator'] == name]
+    return df.drop(columns=['province', 'indicator']).reset_index(drop=True)
+
+
+def pollutant_means(table, province=None):
+    # 대기오염 누적 막대 그래프용: 시군구 × 물질별 연평균 (기존 analyze_air_pollution_data 형태)
+    df = _slice(table, province)
+    df = df[df['indicator'].isin(list(air_pollution.POLLUTANTS))]
+    wide = df.pivot(index='region', columns='indicator', values='raw')
+    wide = wide[[p for p in air_pollution.POLLUTANTS if p in wide.columns]]
+    wide.columns = [f'{p}_평균' for p in wide.columns]
+    return wide.rename_axis('시군구').reset_index()
+
+
+def radar_scores(table, province=None):
+    # 레이더 차트용: 모든 지표가 있는 시군구 × 지표 점수 (컬럼 순서 = INDICATORS 순서, 값이 하나도 없는 지표는 제외)
+    df = _slice(table, province)
+    df = df[df['indicator'].isin(list(INDICATORS))]
+    wide = df.pivot(index='region', columns='indicator', values='score').reindex(columns=list(INDICATORS))
+    # 원본이 없어 통째로 빠진 지표는 축에서 뺌 (그 지표 때문에 모든 시군구가 빠지지 않도록)
+    available = wide.columns[wide.notna().any()]
+    if len(available):
+        wide = wide[available]
+    return wide.dropna()
+
+
+def composite_scores(table, province=None):
+    # 지도 색칠용: 시군구별 종합 점수 (레이더 차트 지표 점수의 평균, 0~1)
+    return radar_scores(table, province).mean(axis=1)
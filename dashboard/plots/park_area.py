@@ -1,55 +1,47 @@
 import pandas as pd
 import plotly.express as px
-
-def analyze_park_area(excel_path: str) -> pd.DataFrame:
-    # 공원 면적 데이터
-    df = pd.read_excel(excel_path)
-    df_subset = df.iloc[3:, [1, 3]]
-    df_subset.columns = ['시군', '면적']
-
-    # 시군별 인구 수
-    regions = [
-        "포항시", "경주시", "김천시", "안동시", "구미시", "영주시", "영천시", "상주시", "문경시", "경산시",
-        "의성군", "청송군", "영양군", "영덕군", "청도군", "고령군", "성주군", "칠곡군", "예천군", "봉화군",
-        "울진군", "울릉군"
-    ]
-
-    population = [
-        498296, 257668, 138999, 154788, 410306, 99894, 101185, 93081, 67674, 285618,
-        49336, 23867, 15494, 34338, 41641, 32350, 43543, 111928, 54868, 28988,
-        47872, 9199
-    ]
-
-    pop_df = pd.DataFrame({'시군': regions, '인구수': population})
-    merged_df = pd.merge(df_subset, pop_df, on='시군')
-
-    merged_df['면적'] = pd.to_numeric(merged_df['면적'], errors='coerce')
-    merged_df['인구수'] = pd.to_numeric(merged_df['인구수'], errors='coerce')
+from plots import cache, regions, population, xlsx, instrument
+from plots.utils import highlight_bar
+
+def load_park_data(excel_path: str) -> pd.DataFrame:
+    # 시군별 공원 면적 원본 → (시도, 시군, 면적) / 상단 헤더 3줄 제외, A·B·D열만 읽음
+    # 시도 이름은 시도별 첫 줄(소계)에만 있으므로 아래로 채움 (소계 행은 분석 단계에서 제외)
+    df_subset = xlsx.read_frame(excel_path, min_row=4, columns=['A', 'B', 'D'], names=['시도', '시군', '면적'])
+    df_subset['시도'] = df_subset['시도'].ffill()
+    df_subset['면적'] = pd.to_numeric(df_subset['면적'], errors='coerce')
+    return df_subset.reset_index(drop=True)
+
+@instrument.timed("analyze")
+def analyze_park_area(excel_path: str, population_file_path: str) -> pd.DataFrame:
+    # 공원 면적 데이터 (전국 시도를 한 번에 표준 이름으로 정리, 소계 행은 NaN → 제외)
+    df_subset = cache.load_source(excel_path, load_park_data)
+    df_subset = df_subset.assign(시도=regions.normalize_province(df_subset['시도']))
+    df_subset = df_subset.assign(시군=regions.normalize(df_subset['시군'], province=df_subset['시도']))
+    df_subset = df_subset.dropna(subset=['시군'])
+
+    # 시군별 인구 수 (plots/population.py)
+    merged_df = population.attach(df_subset, population_file_path, on=('시도', '시군'), name='인구수')
 
     merged_df['공원면적비율'] = merged_df['면적'] / merged_df['인구수']
     merged_df = merged_df.sort_values("공원면적비율", ascending=True)
 
     return merged_df
 
+# df: metrics.indicator(table, 'park') → region, raw(공원 면적), population, per_capita(1인당 공원 면적)
+@instrument.timed("plot")
 def plot_park_area(df: pd.DataFrame, selected_region: str):
-    df["color"] = ["highlight" if r == selected_region else "other" for r in df["시군"]]
-    df["color"] = pd.Categorical(df["color"], categories=["highlight", "other"])
+    df = df.sort_values("per_capita", ascending=True)
 
     fig = px.bar(
         df,
-        x="시군",
-        y="공원면적비율",
-        color="color",
-        color_discrete_map={
-            "highlight": "#2ca02c",  # ✅ 강조 색상 (초록)
-            "other": "#dddddd"       # ✅ 기본 색상 (연회색)
-        },
+        x="region",
+        y="per_capita",
         labels={
-            "시군": "",                  # ✅ x축 제목 숨김
-            "공원면적비율": "1인당 도시공원 면적"  # ✅ y축 제목
+            "region": "",                  # ✅ x축 제목 숨김
+            "per_capita": "1인당 도시공원 면적"  # ✅ y축 제목
         },
-        category_orders={"시군": df["시군"].tolist()},
-        custom_data=["면적", "인구수"]
+        category_orders={"region": df["region"].tolist()},
+        custom_data=["raw", "population"]
     )
 
     fig.update_layout(
@@ -64,4 +56,4 @@ def plot_park_area(df: pd.DataFrame, selected_region: str):
         hovertemplate='공원 총면적: %{customdata[0]}㎡<br>인구 수: %{customdata[1]}명<br>1인당 공원 면적: %{y:.2f}㎡<extra></extra>'
     )
 
-    return fig
+    return highlight_bar(fig, selected_region)
@@ -0,0 +1,197 @@
+# plots/payload.py
+# 그래프 전송량 줄이기 - figcache가 JSON으로 저장하기 전에 한 번만 적용 (모든 세션이 줄어든 JSON을 공유)
+# - template: plotly_white 전체(그래프마다 약 7KB, trace 종류 24개의 기본값)를 보내지 않고
+#   그 그래프에 쓰인 trace 종류와 subplot(polar 등)의 기본값만 남김 → 화면은 같음
+# - 숫자 배열: 유효숫자 6자리로 반올림(hover는 최대 소수 5자리) 후 plotly의 bdata(base64 typed array)로
+#   정수 값은 가장 작은 정수형(i1/u1/i2/u2/i4/u4) → f8 대비 1/2 ~ 1/8
+#   나머지는 float64 (float32는 반올림한 값을 정확히 나타낼 때만 - hover에 float32 오차가 보이지 않도록)
+#   (plotly 6부터 to_dict()가 숫자 배열을 bdata로 줌 - 그 전 버전이면 배열은 그대로 둠)
+# - 위젯 JS 번들: FigureWidget(plotly 6+, anywidget)은 약 5MB짜리 JS(_esm)를 위젯마다 통째로 보냄 (세션당 그래프 6개 = 30MB)
+#   → warm-up에서 www/widgets/plotly.<해시>.js 정적 파일로 저장하고 위젯에는 그 파일을 import하는 짧은 모듈만 넣음
+#   (페이지 주소 기준 상대 경로 → 앱이 하위 경로에 있어도 동작)
+import base64
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.io.json import from_json_plotly
+
+SIGNIFICANT_DIGITS = 6
+WIDGET_DIR = "widgets"
+
+# plotly.js typed array 종류 (bdata spec의 dtype)
+_SHORT_TYPES = {
+    "int8": "i1", "uint8": "u1", "int16": "i2", "uint16": "u2",
+    "int32": "i4", "uint32": "u4", "float32": "f4", "float64": "f8",
+}
+_DTYPES = {short: np.dtype(name) for name, short in _SHORT_TYPES.items()}
+_INT_TYPES = [np.dtype(name) for name in ("int8", "uint8", "int16", "uint16", "int32", "uint32")]
+
+# template.layout 중 해당 trace 종류가 있을 때만 필요한 항목
+SUBPLOT_TRACES = {
+    "polar": {"scatterpolar", "scatterpolargl", "barpolar"},
+    "geo": {"scattergeo", "choropleth"},
+    "ternary": {"scatterternary"},
+    "scene": {"scatter3d", "surface", "mesh3d", "cone", "streamtube", "volume", "isosurface"},
+    "mapbox": {"scattermapbox", "choroplethmapbox", "densitymapbox"},
+    "map": {"scattermap", "choroplethmap", "densitymap"},
+    "coloraxis": {"heatmap", "contour", "histogram2d", "histogram2dcontour", "surface", "choropleth",
+                  "choroplethmap", "choroplethmapbox", "densitymap", "densitymapbox", "parcoords"},
+}
+SUBPLOT_TRACES["colorscale"] = SUBPLOT_TRACES["coloraxis"]
+
+
+# ─── 숫자 배열 ──────────────────────────────────────────────────────
+def _decode(spec):
+    values = np.frombuffer(base64.b64decode(spec["bdata"]), dtype=_DTYPES[spec["dtype"]])
+    if "shape" in spec:
+        values = values.reshape([int(n) for n in str(spec["shape"]).split(",")])
+    return values
+
+
+def _round(values):
+    # 유효숫자 SIGNIFICANT_DIGITS자리로 반올림 (0, NaN, inf는 그대로)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = 10.0 ** (SIGNIFICANT_DIGITS - 1 - np.floor(np.log10(np.abs(values))))
+        rounded = np.round(values * scale) / scale
+    return np.where(np.isfinite(scale) & np.isfinite(rounded), rounded, values)
+
+
+def _typed_array(values):
+    spec = {"dtype": _SHORT_TYPES[values.dtype.name], "bdata": base64.b64encode(np.ascontiguousarray(values)).decode("ascii")}
+    if values.ndim > 1:
+        spec["shape"] = ", ".join(str(n) for n in values.shape)
+    return spec
+
+
+def _smallest_int(values):
+    # 값 범위에 맞는 가장 작은 정수형 (plotly.js에는 64비트 정수 배열이 없음 → 넘치면 None)
+    low, high = values.min(), values.max()
+    for dtype in _INT_TYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return values.astype(dtype)
+    return None
+
+
+def compact_array(values):
+    # 숫자 배열(_DTYPES 중 하나) → 가장 작은 typed array spec ({"dtype", "bdata", "shape"})
+    values = np.asarray(values)
+    integral = values.dtype.kind in "iu" or (np.isfinite(values).all() and (values == np.round(values)).all())
+    if values.size and integral:
+        ints = _smallest_int(values)
+        if ints is not None:
+            return _typed_array(ints)
+    if values.dtype.kind == "f":
+        # float32는 반올림한 값을 그대로 나타낼 때만 (아니면 브라우저가 237.66700744628906처럼 오차까지 표시)
+        rounded = _round(values.astype(np.float64))
+        single = rounded.astype(np.float32)
+        return _typed_array(single if np.array_equal(single.astype(np.float64), rounded, equal_nan=True) else rounded)
+    return _typed_array(values)
+
+
+def _compact(value):
+    # trace 안의 typed array spec을 재귀적으로 찾아 다시 인코딩
+    if isinstance(value, dict):
+        if "bdata" in value and value.get("dtype") in _DTYPES:
+            return compact_array(_decode(value))
+        return {k: _compact(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_compact(v) for v in value]
+    return value
+
+
+# ─── template ───────────────────────────────────────────────────────
+def _trim_template(template, trace_types):
+    if not template:
+        return template
+    layout = {
+        key: value for key, value in template.get("layout", {}).items()
+        if key not in SUBPLOT_TRACES or SUBPLOT_TRACES[key] & trace_types
+    }
+    data = {key: value for key, value in template.get("data", {}).items() if key in trace_types}
+    return {"data": data, "layout": layout}
+
+
+def slim_dict(fig_dict):
+    # 그래프 dict → 줄인 dict (원본은 바꾸지 않음)
+    traces = [_compact(trace) for trace in fig_dict.get("data", [])]
+    layout = dict(fig_dict.get("layout", {}))
+    trace_types = {trace.get("type", "scatter") for trace in traces}
+    if "template" in layout:
+        layout["template"] = _trim_template(layout["template"], trace_types)
+    return {**fig_dict, "data": traces, "layout": layout}
+
+
+def to_json(fig):
+    # Figure → 줄인 JSON 문자열 (figcache에 저장되는 형태)
+    return pio.to_json(slim_dict(fig.to_dict()), validate=False)
+
+
+def report(fig):
+    # 전송량 비교: {"before", "after"} (JSON 바이트 수)
+    before = len(fig.to_json().encode("utf-8"))
+    after = len(to_json(fig).encode("utf-8"))
+    return {"before": before, "after": after}
+
+
+# ─── 위젯 JS 번들 ───────────────────────────────────────────────────
+_bundle = None   # 게시한 번들의 www 기준 상대 경로 (publish_widget_bundle)
+
+
+def publish_widget_bundle(www_dir):
+    # plotly 위젯 JS를 www/widgets/plotly.<해시>.js 로 저장 → www 기준 상대 경로
+    # (위젯이 anywidget 기반이 아니거나(plotly 6 미만) 저장할 수 없으면 None → 위젯마다 JS를 통째로 보냄)
+    # 내용 해시가 이름에 있으므로 plotly 버전이 바뀌면 주소도 바뀜 (브라우저는 1년 캐시)
+    global _bundle
+    esm = getattr(go.FigureWidget, "_esm", None)   # 문자열 또는 anywidget FileContents
+    if esm is None:
+        return None
+    source = str(esm).encode("utf-8")
+    name = f"plotly.{hashlib.sha256(source).hexdigest()[:12]}.js"
+    directory = Path(www_dir) / WIDGET_DIR
+    path = directory / name
+    try:
+        if not path.exists():
+            directory.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")   # worker 여러 개가 동시에 써도 섞이지 않도록
+            tmp.write_bytes(source)
+            os.replace(tmp, path)
+        for old in directory.glob("plotly.*.js"):
+            if old != path:
+                old.unlink(missing_ok=True)
+    except OSError:
+        return None
+    _bundle = f"{WIDGET_DIR}/{name}"
+    return _bundle
+
+
+def widget_esm():
+    # 위젯 _esm 대신 보낼 짧은 모듈 - 게시한 번들을 페이지 주소 기준으로 import (번들이 없으면 None)
+    # anywidget은 http(s) 주소가 아닌 _esm을 소스 코드로 실행하므로 상대 경로를 그대로 넣을 수 없음
+    if _bundle is None:
+        return None
+    return f'export default (await import(new URL("{_bundle}", document.baseURI).href)).default;\n'
+
+
+_widget_classes = {}
+
+
+def widget_class(esm=None):
+    # _esm만 바꾼 FigureWidget 클래스 (esm이 없으면 원래 FigureWidget - JS를 통째로 보냄)
+    # 클래스 이름·모듈은 원래와 같게 둠 (shinywidgets가 모듈 이름으로 plotly 위젯을 알아봄)
+    if esm is None:
+        return go.FigureWidget
+    cls = _widget_classes.get(esm)
+    if cls is None:
+        cls = type("FigureWidget", (go.FigureWidget,), {"_esm": esm, "__module__": go.FigureWidget.__module__})
+        _widget_classes[esm] = cls
+    return cls
+
+
+def as_widget(fig_json, esm=None):
+    # JSON → FigureWidget (pio.from_json은 output_type으로 이름만 받으므로 직접 생성)
+    return widget_class(esm)(from_json_plotly(fig_json))
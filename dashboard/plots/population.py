@@ -0,0 +1,73 @@
+# plots/population.py
+# 시군구 인구 - 모든 분석 모듈이 같이 쓰는 단일 출처 (경상북도 주민등록.xlsx)
+# - 통합문서를 스트리밍으로 한 번만 읽음 (plots/xlsx.py, 필요한 시트의 구분·총계 2개 컬럼만, 표가 끝나면 중단)
+# - 읍면동 행을 시군구로 합산하고 원본의 시군구 합계 행과 비교 (다르면 경고)
+# - (시도, 시군구) 인덱스 Series로 제공 → 모듈마다 따로 파싱하거나 인구 수를 하드코딩하지 않음
+import logging
+
+import pandas as pd
+
+from plots import cache, regions, xlsx
+
+logger = logging.getLogger("dashboard.data")
+
+SHEET = "1-2. 읍면동별 인구 및 세대현황"
+FIRST_ROW = 6            # 4~5행은 2줄 헤더, 6행(경상북도 합계)부터 데이터
+NAME_COL, TOTAL_COL = 1, 3   # A열: 구분, C열: 총계
+
+# 주민등록 인구 원본은 경상북도 통계 → 시도 고정
+PROVINCE = regions.GYEONGBUK
+
+
+def load_population(population_file_path: str) -> pd.DataFrame:
+    # 주민등록 인구 원본 → (region, population) 원본 행 그대로 (시도 합계 / 시군 합계 / 구 / 읍면동)
+    # 이 파일은 4MB짜리 외부 링크 XML과 큰 서식 파일을 담고 있는데 xlsx reader는 둘 다 읽지 않음
+    pop_df = xlsx.read_frame(
+        population_file_path, SHEET, min_row=FIRST_ROW, columns=[NAME_COL, TOTAL_COL],
+        names=["region", "population"], stop=lambda row: row[0] is None  # 구분이 빈 행 = 표 끝
+    )
+    pop_df["region"] = pop_df["region"].astype(str).str.strip()
+    pop_df["population"] = pd.to_numeric(pop_df["population"], errors="coerce")
+    return pop_df
+
+
+def aggregate(pop_df: pd.DataFrame, province: str = PROVINCE) -> pd.DataFrame:
+    # 원본 행 → 시군구별 (합계 행 인구, 읍면동 합산 인구)
+    # 시·군 행이 나오면 새 시군구 구간 시작, 구간 안의 읍·면·동 행을 합산 (포항시 남구/북구 같은 구 합계 행은 건너뜀)
+    names = pop_df["region"]
+    is_region = names.str.endswith(("시", "군"))
+    is_leaf = names.str.endswith(("읍", "면", "동"))
+
+    # 시·군 행마다 새 구간 번호 → 구간의 표준 시군구 이름 (사전에 없는 시군(군위군)과 첫 줄 시도 합계는 NaN)
+    block_id = is_region.cumsum()
+    region = regions.normalize(names[is_region], province=province).astype(object)
+    block = block_id.map(pd.Series(region.to_numpy(), index=block_id[is_region].to_numpy()))
+
+    totals = pop_df["population"][is_region].groupby(region).sum()
+    leaves = pop_df["population"][is_leaf].groupby(block[is_leaf]).sum()
+
+    out = pd.DataFrame({"population": totals, "leaf_sum": leaves.reindex(totals.index)})
+    out.index = pd.MultiIndex.from_arrays([[province] * len(out), out.index], names=["province", "region"])
+
+    mismatch = out[out["population"] != out["leaf_sum"]]
+    for (_, name), row in mismatch.iterrows():
+        logger.warning("인구 합계 불일치: %s 합계 %.0f / 읍면동 합산 %.0f", name, row['population'], row['leaf_sum'])
+    return out
+
+
+def _by_region(population_file_path: str) -> pd.Series:
+    return aggregate(cache.load_source(population_file_path, load_population))["population"]
+
+
+def get_population(population_file_path: str) -> pd.Series:
+    # (시도, 시군구) → 인구 수 / 파일이 바뀌지 않으면 프로세스 전체에서 한 번만 계산
+    return cache.load(population_file_path, _by_region)
+
+
+def attach(df: pd.DataFrame, population_file_path: str, on=("province", "region"), name="population") -> pd.DataFrame:
+    # df의 (시도, 시군구) 컬럼으로 인구 수를 붙임 (인구 자료가 없는 지역은 제외)
+    pop = get_population(population_file_path).rename(name)
+    keys = [df[col].astype(object) for col in on]
+    values = pop.reindex(pd.MultiIndex.from_arrays(keys)).to_numpy()
+    out = df.assign(**{name: values})
+    return out[out[name].notna()]
@@ -1,56 +1,61 @@
 import pandas as pd
 import plotly.express as px
-from plots.utils import unify_and_filter_region
-
+from plots import cache, population, regions, instrument
+from plots.utils import unify_and_filter_region, highlight_bar
+
+# 시설 원본에서 실제로 쓰는 컬럼만 읽음 (시설명·좌표 등 나머지 컬럼은 디코딩하지 않음)
+FACILITY_COLUMNS = ["시도 명칭", "시군구 명칭", "카테고리2"]
+CHUNK_ROWS = 50_000
+
+def load_facility_data(facility_file_path: str, provinces=(regions.GYEONGBUK,)) -> pd.DataFrame:
+    # 한국문화정보원 전국 반려동물 동반 가능 시설 (cp949 csv)
+    # - CHUNK_ROWS 행씩 읽으면서 바로 시도 조건으로 거름 → 전국 파일이 커져도 메모리는 일정
+    # - provinces: 남길 시도 (기본값 = 인구 자료가 있는 경상북도, None이면 전국)
+    #   이 기본값도 loader 코드의 일부라서 바꾸면 build artifact가 자동으로 다시 만들어짐
+    chunks = []
+    with pd.read_csv(facility_file_path, encoding="cp949", usecols=FACILITY_COLUMNS,
+                     dtype=str, chunksize=CHUNK_ROWS) as reader:
+        for chunk in reader:
+            if provinces is not None:
+                chunk = chunk[regions.normalize_province(chunk["시도 명칭"]).isin(provinces)]
+            chunks.append(chunk)
+
+    df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=FACILITY_COLUMNS)
+    return df[FACILITY_COLUMNS].astype("category")
+
+@instrument.timed("analyze")
 def analyze_population_facility_ratio(facility_file_path: str, population_file_path: str) -> pd.DataFrame:
-    facility_df = pd.read_csv(facility_file_path, encoding="cp949")
+    facility_df = cache.load_source(facility_file_path, load_facility_data)
 
+    # 시설 → (시도, 시군구)별 시설 수를 한 번의 groupby로 계산
     facility_df = unify_and_filter_region(facility_df, "시도 명칭", "시군구 명칭")
-
-
-    pop_raw = pd.read_excel(
-        population_file_path,
-        sheet_name="1-2. 읍면동별 인구 및 세대현황",
-        header=[3, 4]
+    df_fac_cnt = (
+        facility_df.groupby(["province", "region"], observed=True).size()
+        .reset_index(name="facility_count")
     )
-    pop_df = pop_raw[[("구분", "Unnamed: 0_level_1"), ("총계", "총   계")]].copy()
-    pop_df.columns = ["region", "population"]
-
- 
-    pop_df = unify_and_filter_region(pop_df, "region")
 
-    pop_df = pop_df[pop_df["region"].isin(facility_df["region"].unique())]
-    df_fac_cnt = facility_df.groupby("region").size().reset_index(name="facility_count")
-
-    df_merge = pd.merge(df_fac_cnt, pop_df, on="region")
+    # 시군구 인구 (plots/population.py, 인구 자료가 있는 시군구만 남음)
+    df_merge = population.attach(df_fac_cnt, population_file_path)
     df_merge["per_person"] = df_merge["facility_count"] / df_merge["population"]
     df_merge = df_merge.sort_values("per_person", ascending=True)
 
     return df_merge
 
 
+# df: metrics.indicator(table, 'facility') → region, raw(시설 수), population, per_capita(1인당 시설 수)
+@instrument.timed("plot")
 def plot_population_facility_ratio(df: pd.DataFrame, selected_region: str):
-    df = df.copy()
-
-    df["color"] = pd.Categorical(
-        ["highlight" if r == selected_region else "other" for r in df["region"]],
-        categories=["highlight", "other"]
-    )
+    df = df.sort_values("per_capita", ascending=True)
 
     fig = px.bar(
         df,
         x="region",
-        y="per_person",
-        color="color",
-        color_discrete_map={
-            "highlight": "#2ca02c",  # 강조 색상 (초록)
-            "other": "#dddddd"       # 기본 색상 (연회색)
-        },
+        y="per_capita",
         category_orders={"region": df["region"].tolist()},
-        custom_data=["facility_count", "population"],
+        custom_data=["raw", "population"],
         labels={
             "region": "",               # ✅ x축 제목 숨김
-            "per_person": "1인당 시설 수"  # ✅ y축 제목
+            "per_capita": "1인당 시설 수"  # ✅ y축 제목
         }
     )
 
@@ -67,4 +72,4 @@ def plot_population_facility_ratio(df: pd.DataFrame, selected_region: str):
         hovertemplate='시설 수: %{customdata[0]}개<br>인구 수: %{customdata[1]}명<br>1인당 시설 수: %{y:.6f}<extra></extra>'
     )
 
-    return fig
+    return highlight_bar(fig, selected_region)
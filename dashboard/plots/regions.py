@@ -0,0 +1,206 @@
+# plots/regions.py
+# 시군구 지명 사전 (gazetteer)
+# - 전국 시도/시군구 목록은 data/regions.csv (행정구역 코드, 시도, 표준 이름, 별칭)에서 읽음
+# - 같은 이름이 여러 시도에 있으므로(중구, 고성군 ...) (시도, 이름)으로 찾음
+# - 원본마다 제각각인 표기(포항북부·포항남부, '경주', '경상북도 포항시 북구' 등)를 표준 이름으로 통일
+# - normalize(): 고유값마다 한 번만 찾아보고 categorical 코드로 전체 행에 펼침 → 행 수가 아니라 고유값 수만큼만 비용
+import os
+import re
+import threading
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+Region = namedtuple("Region", ["code", "name", "province", "aliases"])
+
+GYEONGBUK = "경상북도"
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "regions.csv")
+
+# 원본마다 다른 시도 표기 → 표준 이름 (명칭이 바뀌기 전 이름 포함)
+PROVINCE_ALIASES = {
+    "서울": "서울특별시", "서울시": "서울특별시",
+    "부산": "부산광역시", "부산시": "부산광역시",
+    "대구": "대구광역시", "대구시": "대구광역시",
+    "인천": "인천광역시", "인천시": "인천광역시",
+    "광주": "광주광역시", "광주시": "광주광역시",
+    "대전": "대전광역시", "대전시": "대전광역시",
+    "울산": "울산광역시", "울산시": "울산광역시",
+    "세종": "세종특별자치시", "세종시": "세종특별자치시",
+    "경기": "경기도",
+    "강원": "강원특별자치도", "강원도": "강원특별자치도",
+    "충북": "충청북도",
+    "충남": "충청남도",
+    "전북": "전북특별자치도", "전라북도": "전북특별자치도",
+    "전남": "전라남도",
+    "경북": "경상북도",
+    "경남": "경상남도",
+    "제주": "제주특별자치도", "제주도": "제주특별자치도",
+}
+
+
+class Gazetteer:
+    def __init__(self, regions, path=None):
+        self.path = path  # 데이터 버전 계산용 (메모리에서 만든 사전이면 None)
+        self.regions = list(regions)
+        self.provinces = list(dict.fromkeys(r.province for r in self.regions))
+        self.names = list(dict.fromkeys(r.name for r in self.regions))  # 시도가 달라도 같은 이름은 하나로
+        self._by_code = {r.code: r for r in self.regions}
+        self._index = {}    # (시도, 이름·별칭) → Region
+        self._by_key = {}   # 이름·별칭 → [Region, ...] (시도 없이 찾을 때는 하나뿐인 경우에만 사용)
+        for r in self.regions:
+            for key in _keys(r):
+                self._index.setdefault((r.province, key), r)
+                candidates = self._by_key.setdefault(key, [])
+                if r not in candidates:
+                    candidates.append(r)
+        self._position = {name: i for i, name in enumerate(self.names)}
+        self._province_position = {name: i for i, name in enumerate(self.provinces)}
+        self._patterns = {}  # 시도 → 표준 이름 정규식 (부분 문자열 검색용, 처음 쓸 때 만듦)
+
+    def by_code(self, code):
+        return self._by_code.get(str(code))
+
+    def in_province(self, province):
+        return [r for r in self.regions if r.province == province]
+
+    def province(self, value):
+        # 시도 표기 → 표준 시도 이름 (없으면 None)
+        if not isinstance(value, str):
+            return None
+        value = value.strip()
+        if value in self._province_position:
+            return value
+        value = PROVINCE_ALIASES.get(value)
+        return value if value in self._province_position else None
+
+    def _get(self, key, province):
+        if province is not None:
+            return self._index.get((province, key))
+        candidates = self._by_key.get(key, ())
+        return candidates[0] if len(candidates) == 1 else None
+
+    def lookup(self, value, province=None):
+        # 표준 이름 / 별칭 / 공백으로 나뉜 토큰 / (시도를 알 때) 부분 문자열 순으로 찾음 (없으면 None)
+        if not isinstance(value, str):
+            return None
+        if province is not None:
+            province = self.province(province)
+            if province is None:
+                return None
+        value = value.strip()
+        region = self._get(value, province)
+        if region is not None:
+            return region
+
+        tokens = value.split()
+        if province is None and len(tokens) > 1 and self.province(tokens[0]):
+            # '서울특별시 중구'처럼 시도가 앞에 붙은 경우
+            province, tokens = self.province(tokens[0]), tokens[1:]
+        for token in tokens:
+            region = self._get(token, province)
+            if region is not None:
+                return region
+
+        if province is not None:
+            match = self._pattern(province).search(value)
+            if match:
+                return self._index[(province, match.group(0))]
+        return None
+
+    def canonical(self, value, province=None):
+        region = self.lookup(value, province)
+        return region.name if region else None
+
+    def _pattern(self, province):
+        pattern = self._patterns.get(province)
+        if pattern is None:
+            names = sorted((r.name for r in self.in_province(province)), key=len, reverse=True)
+            pattern = re.compile("|".join(map(re.escape, names)) or "(?!)")
+            self._patterns[province] = pattern
+        return pattern
+
+    def normalize(self, values, province=None):
+        # values의 고유값(시도가 Series면 (시도, 값) 쌍)만 찾아보고 표준 이름 categorical로 반환 (못 찾으면 NaN)
+        values = pd.Series(values)
+        if isinstance(province, (pd.Series, pd.Index, np.ndarray, list)):
+            pairs = pd.MultiIndex.from_arrays([pd.Series(province, index=values.index), values])
+            codes, uniques = pairs.factorize()
+            found = [self.lookup(v, p if isinstance(p, str) else "") for p, v in uniques]
+        else:
+            codes, uniques = pd.factorize(values)
+            found = [self.lookup(v, province) for v in uniques]
+        positions = [self._position[r.name] if r else -1 for r in found]
+        return _broadcast(codes, positions, self.names, values)
+
+    def normalize_province(self, values):
+        # 시도 표기 → 표준 시도 이름 categorical (못 찾으면 NaN)
+        values = pd.Series(values)
+        codes, uniques = pd.factorize(values)
+        positions = [self._province_position.get(self.province(v), -1) for v in uniques]
+        return _broadcast(codes, positions, self.provinces, values)
+
+
+def _keys(region):
+    keys = [region.name, *region.aliases]
+    # '경주시' → '경주'처럼 시·군을 뗀 짧은 이름도 별칭으로 (경찰서 이름 등)
+    if region.name[-1] in "시군" and len(region.name) > 2:
+        keys.append(region.name[:-1])
+    return keys
+
+
+def _broadcast(codes, positions, categories, values):
+    # 고유값 → 카테고리 번호 (맨 끝의 -1은 factorize가 NaN에 준 코드 -1용)
+    lookup = np.array(positions + [-1], dtype=np.int64)
+    result = pd.Categorical.from_codes(lookup[codes], categories=categories)
+    return pd.Series(result, index=values.index, name=values.name)
+
+
+def load(path=DEFAULT_PATH):
+    # regions.csv: code, province, name, aliases('|'로 구분)
+    df = pd.read_csv(path, dtype=str, keep_default_na=False, encoding="utf-8")
+    regions = [
+        Region(row.code, row.name, row.province, tuple(a for a in row.aliases.split("|") if a))
+        for row in df.itertuples(index=False)
+    ]
+    return Gazetteer(regions, path=path)
+
+
+_default = None
+_lock = threading.Lock()
+
+
+def default():
+    global _default
+    if _default is None:
+        with _lock:
+            if _default is None:
+                _default = load()
+    return _default
+
+
+def set_default(gazetteer):
+    # 다른 지역 집합으로 교체할 때 사용
+    global _default
+    _default = gazetteer
+
+
+def provinces():
+    return list(default().provinces)
+
+
+def lookup(value, province=None):
+    return default().lookup(value, province)
+
+
+def canonical(value, province=None):
+    return default().canonical(value, province)
+
+
+def normalize(values, province=None):
+    return default().normalize(values, province)
+
+
+def normalize_province(values):
+    return default().normalize_province(values)
@@ -0,0 +1,236 @@
+# plots/synthetic.py
+# 합성 원본 데이터 생성기 - 실제 원본과 같은 파일 이름·형식·시트 구조 (각 loader가 그대로 읽음), 값은 고정 seed 난수
+# - 원본 없이(오프라인, 공개 저장소) 대시보드를 띄우거나, 실제보다 큰 데이터로 부하·성능을 시험할 때 사용
+# - 지역 수: 경상북도 시군부터 지명 사전(data/regions.csv) 순서로 n개 (경상북도만 있는 원본 - 인구·범죄·교통사고 - 은 그중 경상북도 시군만)
+# - 행 배율: 시설 건수, 범죄 중분류 수, 연도 수, 시군당 읍면동 수에 곱함
+#   python dashboard/cli.py generate-data [--out 폴더] [--regions N] [--rows R]
+import json
+import os
+from collections import namedtuple
+
+import numpy as np
+import openpyxl
+import pandas as pd
+import shapely
+
+from plots import air_pollution, population, population_facility, regions
+
+# 실제 원본과 같은 파일 이름 (shared.py의 데이터 파일 경로와 같음)
+FILE_NAMES = {
+    "park": "시군별_공원_면적.xlsx",
+    "accident": "경상북도 시도별 교통사고 건수.xlsx",
+    "facility": "한국문화정보원_전국 반려동물 동반 가능 문화시설 위치 데이터_20221130.csv",
+    "population": "경상북도 주민등록.xlsx",
+    "crime": "경찰청_범죄 발생 지역별 통계.xlsx",
+    "pollution": "월별_도시별_대기오염도.xlsx",
+    "geojson": "gyeongbuk_polygon_4326.geojson",
+}
+# shared.DATA_FILES와 같은 순서
+DATA_KEYS = ["park", "accident", "facility", "population", "crime", "pollution"]
+
+# regions: 지역 목록, gyeongbuk: 그중 경상북도 시군, rows: 행 배율, stations: 시군당 측정소 수, vertices: 경계 한 변의 꼭짓점 수
+Spec = namedtuple("Spec", ["regions", "gyeongbuk", "rows", "stations", "vertices"])
+
+CRIME_GROUPS = ["강력범죄", "절도범죄", "폭력범죄", "지능범죄", "풍속범죄", "특별경제범죄", "마약범죄",
+                "보건범죄", "환경범죄", "교통범죄", "노동범죄", "안보범죄", "선거범죄", "병역범죄", "기타범죄"]
+FACILITY_CATEGORIES = ["동반여행", "반려의료", "반려동물 서비스", "반려문화시설", "반려동물식당카페"]
+MONTHS = [2023.11, 2023.12, 2024.01, 2024.02, 2024.03, 2024.04, 2024.05, 2024.06, 2024.07, 2024.08, 2024.09, 2024.1]
+
+
+def _stations(region):
+    # 경찰서 이름: 시군 이름에서 시·군을 뗀 것 (포항시처럼 경찰서가 둘이면 '포항북부', '포항남부')
+    split = [a for a in region.aliases if a.endswith(("북부", "남부"))]
+    return split or [region.name[:-1]]
+
+
+def _population_row(name, total):
+    foreign = total // 30
+    korean = total - foreign
+    return [name, total // 2, total, total - total // 2, total // 2,
+            korean, korean - korean // 2, korean // 2, foreign, foreign - foreign // 2, foreign // 2]
+
+
+def write_population(path, spec, rng):
+    # 1-2 시트: 제목·단위 3줄 + 2줄 헤더, 6행 도 합계부터 시군 합계 → (구 합계) → 읍면동 순
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(population.SHEET)
+    ws.append([])
+    ws.append([f"{population.SHEET} (2025년 1분기)"])
+    ws.append(["* 행정동 기준"] + [None] * 9 + ["(단위 : 세대, 명)"])
+    ws.append(["구분", "세대수", "총계", None, None, "한국인", None, None, "외국인", None, None])
+    ws.append([None, None, "총   계", "남", "여", "소   계", "남", "여", "소계", "남", "여"])
+
+    blocks = []
+    for region in spec.gyeongbuk:
+        stem = region.name[:-1]
+        leaves = [(f"{stem}{i + 1}{'읍면동'[i % 3]}", int(n))
+                  for i, n in enumerate(rng.integers(800, 25_000, size=15 * spec.rows))]
+        districts = [a.split()[-1] for a in region.aliases if " " in a]  # 포항시 북구 / 남구
+        blocks.append((region.name, districts, leaves))
+
+    ws.append(_population_row(regions.GYEONGBUK, sum(n for _, _, leaves in blocks for _, n in leaves)))
+    for name, districts, leaves in blocks:
+        ws.append(_population_row(name, sum(n for _, n in leaves)))
+        parts = np.array_split(np.arange(len(leaves)), len(districts) or 1)
+        for district, part in zip(districts or [None], parts):
+            if district:
+                ws.append(_population_row(district, sum(leaves[i][1] for i in part)))
+            for i in part:
+                ws.append(_population_row(*leaves[i]))
+    wb.save(path)
+
+
+def write_crime(path, spec, rng):
+    # 범죄대분류 / 범죄중분류 + 경상북도 시군별 발생 건수 (wide)
+    names = [r.name for r in spec.gyeongbuk]
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("경찰청_범죄 발생 지역별 통계_20231231")
+    ws.append(["범죄대분류", "범죄중분류"] + names)
+    counts = rng.poisson(rng.uniform(1, 120, size=(38 * spec.rows, 1)), size=(38 * spec.rows, len(names)))
+    for i, row in enumerate(counts):
+        group = CRIME_GROUPS[i % len(CRIME_GROUPS)]
+        ws.append([group, f"{group[:2]}{i // len(CRIME_GROUPS) + 1}"] + row.tolist())
+    wb.save(path)
+
+
+def write_accident(path, spec, rng):
+    # 연도 / 구분(사고·사망·부상) + 경찰서별 건수
+    stations = [s for r in spec.gyeongbuk for s in _stations(r)]
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("경찰청 경상북도경찰청_교통사고발생현황_20231231")
+    ws.append(["연도", "구분"] + stations)
+    base = rng.uniform(50, 1500, size=len(stations))
+    for year in range(2023, 2023 - 4 * spec.rows, -1):
+        accidents = rng.poisson(base)
+        ws.append([year, "사고"] + accidents.tolist())
+        ws.append([year, "사망"] + rng.poisson(accidents * 0.02).tolist())
+        ws.append([year, "부상"] + rng.poisson(accidents * 1.4).tolist())
+    wb.save(path)
+
+
+def write_park(path, spec, rng):
+    # KOSIS 내려받기 형식: 헤더 3줄, 시도 이름은 시도별 첫 줄(소계)에만
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("데이터")
+    ws.append(["소재지(시군구)별(1)", "소재지(시군구)별(2)", "2023", "2023"])
+    ws.append(["소재지(시군구)별(1)", "소재지(시군구)별(2)", "계", "계"])
+    ws.append(["소재지(시군구)별(1)", "소재지(시군구)별(2)", "시설수 (개소)", "면적 (㎡)"])
+    by_province = {}
+    for region in spec.regions:
+        by_province.setdefault(region.province, []).append(region)
+    for province, members in by_province.items():
+        counts = rng.integers(10, 350, size=len(members))
+        areas = rng.integers(200_000, 9_000_000, size=len(members))
+        ws.append([province, "소계", int(counts.sum()), int(areas.sum())])
+        for region, count, area in zip(members, counts, areas):
+            ws.append([None, region.name, int(count), int(area)])
+    meta = wb.create_sheet("메타정보")
+    meta.append(["○ 통계표명", "공원"])
+    wb.save(path)
+
+
+def write_pollution(path, spec, rng):
+    # 오염물질 시트 5개: 구분(1)=시도, 구분(2)=시군, 월 컬럼(2023.11 ~ 2024.1), 시군당 측정소 spec.stations개
+    wb = openpyxl.Workbook(write_only=True)
+    for pollutant, sheet in air_pollution.POLLUTANTS.items():
+        ws = wb.create_sheet(sheet)
+        ws.append(["구분(1)", "구분(2)"] + MONTHS)
+        level = {"PM2.5": 18, "PM10": 30, "O3": 0.03, "CO": 0.4, "NO2": 0.012}[pollutant]
+        for region in spec.regions:
+            for _ in range(spec.stations):
+                values = np.round(rng.gamma(8, level / 8, size=len(MONTHS)), 3)
+                ws.append([region.province, region.name] + values.tolist())
+    wb.save(path)
+
+
+def write_facility(path, spec, rng):
+    # 전국 시설 목록 (cp949 csv, 원본처럼 항상 전국) - 포항처럼 구가 있는 시는 '포항시 남구' 식으로도 나옴
+    n = 3_000 * spec.rows
+    gazetteer = regions.default()
+    picks = rng.integers(0, len(gazetteer.regions), size=n)
+    names = np.array([r.name for r in gazetteer.regions], dtype=object)[picks]
+    variants = {i: [a for a in r.aliases if " " in a] for i, r in enumerate(gazetteer.regions)}
+    use_variant = rng.random(n) < 0.5
+    for i in np.flatnonzero(use_variant):
+        if variants[picks[i]]:
+            names[i] = variants[picks[i]][i % len(variants[picks[i]])]
+    df = pd.DataFrame({
+        "시설명": [f"시설{i}" for i in range(n)],
+        "카테고리1": "반려동물업",
+        "카테고리2": np.array(FACILITY_CATEGORIES, dtype=object)[rng.integers(0, len(FACILITY_CATEGORIES), size=n)],
+        "시도 명칭": np.array([r.province for r in gazetteer.regions], dtype=object)[picks],
+        "시군구 명칭": names,
+        "위도": np.round(rng.uniform(33.2, 38.5, size=n), 6),
+        "경도": np.round(rng.uniform(125.0, 131.0, size=n), 6),
+    })
+    assert set(population_facility.FACILITY_COLUMNS) <= set(df.columns)
+    df.to_csv(path, index=False, encoding="cp949")
+
+
+def write_geojson(path, spec, rng):
+    # 격자 모양 시군 경계 (인접 시군이 경계를 공유하는 coverage) + 경계선 굴곡
+    # 경계 한 변에 꼭짓점 spec.vertices개 (기본 200 → 경상북도 22개 시군이면 실제 경계 파일과 비슷한 크기)
+    members = spec.regions
+    cols = int(np.ceil(np.sqrt(len(members))))
+    size = 1.6 / cols
+    cells = np.array([
+        shapely.box(128.0 + (i % cols) * size, 35.6 + (i // cols) * size,
+                    128.0 + (i % cols + 1) * size, 35.6 + (i // cols + 1) * size)
+        for i in range(len(members))
+    ])
+    step = size / spec.vertices
+    cells = shapely.transform(shapely.segmentize(cells, step),
+                              lambda c: c + size * 0.03 * np.sin(c[:, ::-1] * 40))
+    features = [
+        {"type": "Feature", "properties": {"행정구역": r.name, "code": r.code},
+         "geometry": json.loads(shapely.to_geojson(geom))}
+        for r, geom in zip(members, cells)
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"type": "FeatureCollection", "features": features}, f, ensure_ascii=False)
+
+
+WRITERS = {
+    "park": write_park,
+    "accident": write_accident,
+    "facility": write_facility,
+    "population": write_population,
+    "crime": write_crime,
+    "pollution": write_pollution,
+    "geojson": write_geojson,
+}
+
+
+def select_regions(n=None):
+    # 경상북도 시군 먼저, 나머지는 지명 사전 순서 → 앞에서 n개 (None이면 전국)
+    gazetteer = regions.default()
+    ordered = gazetteer.in_province(regions.GYEONGBUK)
+    ordered = ordered + [r for r in gazetteer.regions if r.province != regions.GYEONGBUK]
+    if n is not None and not 0 < n <= len(ordered):
+        raise ValueError(f"지역 수는 1 ~ {len(ordered)} 사이여야 합니다: {n}")
+    return ordered[:n]
+
+
+def make_spec(n_regions=None, rows=1, stations=1, vertices=200):
+    members = select_regions(n_regions)
+    return Spec(members, [r for r in members if r.province == regions.GYEONGBUK], rows, stations, vertices)
+
+
+def generate(directory, spec, seed=0, only=None, overwrite=False):
+    # directory에 합성 원본 생성 → {이름: 경로} (only: 만들 원본 이름 목록, overwrite=False면 있는 파일은 건너뜀)
+    os.makedirs(directory, exist_ok=True)
+    paths = {key: os.path.join(str(directory), name) for key, name in FILE_NAMES.items()}
+    for index, (key, writer) in enumerate(WRITERS.items()):
+        if only is not None and key not in only:
+            continue
+        if not overwrite and os.path.exists(paths[key]):
+            continue
+        tmp = paths[key] + ".tmp" + os.path.splitext(paths[key])[1]  # openpyxl은 확장자로 형식을 정함
+        writer(tmp, spec, np.random.default_rng([seed, index]))
+        os.replace(tmp, paths[key])
+    return paths
+
+
+def data_files(paths):
+    # analyze_* / metrics.build_metrics 인자 순서 (shared.DATA_FILES와 같음)
+    return tuple(paths[key] for key in DATA_KEYS)
@@ -1,24 +1,29 @@
 # plots/utils.py
 import pandas as pd
+from plots import regions
 
-def unify_and_filter_region(df: pd.DataFrame, col: str, second_col: str = None) -> pd.DataFrame:
+def unify_and_filter_region(df: pd.DataFrame, col: str, second_col: str = None, province: str = None) -> pd.DataFrame:
     df = df.copy()
 
-    # 시군구 단위 기준 정리
-    region_keywords = [
-        "포항시", "경주시", "김천시", "안동시", "구미시", "영주시", "영천시", "상주시", "문경시", "경산시",
-        "의성군", "청송군", "영양군", "영덕군", "청도군", "고령군", "성주군", "칠곡군", "예천군", "봉화군",
-        "울진군", "울릉군"
-    ]
-
-    pattern = "(" + "|".join(region_keywords) + ")"
-
+    # (시도, 시군구) 단위 기준 정리 (지명 사전에 없는 지역·군위군(대구 편입)은 region = NaN)
+    # - second_col이 있으면 col = 시도 컬럼, second_col = 시군구 컬럼 (전국 데이터)
+    # - 없으면 col = 시군구 컬럼, 시도는 province로 고정 (한 시도만 담긴 데이터)
     if second_col and second_col in df.columns:
-        df['region_raw'] = df[col].astype(str).str.strip() + " " + df[second_col].astype(str).str.strip()
-        df['region'] = df['region_raw'].str.extract(pattern)[0]
+        df['province'] = regions.normalize_province(df[col])
+        df['region'] = regions.normalize(df[second_col], province=df['province'])
     else:
-        df['region'] = df[col].astype(str).str.strip().str.extract(pattern)[0]
+        df['province'] = province
+        df['region'] = regions.normalize(df[col], province=province)
+    return df
+
+
 
-    # 군위군 제거
-    return df[df['region'] != '군위군']
+# ─── 선택 지역 강조 ─────────────────────────────────────────────────
+# 그래프는 한 번만 만들고, 지역이 바뀌면 색상 배열만 교체 (FigureWidget에 그대로 적용 가능)
+HIGHLIGHT_COLOR = "#2ca02c"  # ✅ 강조 색상 (초록)
+OTHER_COLOR = "#dddddd"      # ✅ 기본 색상 (연회색)
 
+def highlight_bar(fig, selected_region):
+    for trace in fig.data:
+        trace.marker.color = [HIGHLIGHT_COLOR if x == selected_region else OTHER_COLOR for x in trace.x]
+    return fig
@@ -0,0 +1,188 @@
+# plots/xlsx.py
+# xlsx 스트리밍 reader (openpyxl read-only) - plots/* 의 모든 엑셀 loader가 사용
+# - 필요한 시트만, 필요한 컬럼만(column projection), 필요한 행까지만(stop 조건에서 중단) 읽음
+# - values_only 반복 → 셀 객체를 만들지 않음
+# - 값만 필요하므로 서식(styles.xml)과 외부 링크는 읽지 않음 (주민등록 파일은 이 두 가지가 여는 시간의 대부분)
+#   → 날짜 서식 셀은 datetime이 아니라 엑셀 일련번호(숫자)로 나옴. 현재 원본들에는 날짜 셀이 없음
+# - 시트별로 읽은 행 수 / 바이트 수(압축 해제 기준, 셀 수 없으면 None) / 걸린 시간을 기록 → stats()
+import logging
+import os
+import threading
+import time
+
+import openpyxl
+import pandas as pd
+from openpyxl.reader.excel import ExcelReader
+from openpyxl.utils import column_index_from_string
+
+logger = logging.getLogger("dashboard.xlsx")
+
+_stats = {}   # (파일 이름, 시트) -> {"rows", "bytes", "seconds"}
+_lock = threading.Lock()
+
+
+class _CountingFile:
+    # zip 안의 시트 XML을 읽은 바이트 수 세기
+    def __init__(self, fh, counter):
+        self._fh = fh
+        self._counter = counter
+
+    def read(self, size=-1):
+        data = self._fh.read(size)
+        self._counter[0] += len(data)
+        return data
+
+    def close(self):
+        self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _CountingArchive:
+    def __init__(self, archive, counter):
+        self._archive = archive
+        self._counter = counter
+
+    def open(self, name, *args, **kwargs):
+        return _CountingFile(self._archive.open(name, *args, **kwargs), self._counter)
+
+    def __getattr__(self, name):
+        return getattr(self._archive, name)
+
+
+def open_workbook(path):
+    # 서식·외부 링크를 건너뛴 read-only 통합문서
+    # (ExcelReader 단계 중 서식 적용만 뺀 것 / openpyxl 버전이 달라 실패하면 일반 read-only로 염)
+    reader = ExcelReader(path, read_only=True, data_only=True, keep_links=False)
+    try:
+        reader.read_manifest()
+        reader.read_strings()
+        reader.read_workbook()
+        reader.read_worksheets()
+        return reader.wb
+    except Exception:
+        reader.archive.close()
+        logger.debug("서식 생략 열기 실패, 일반 read-only로 엶: %s", path, exc_info=True)
+        return openpyxl.load_workbook(path, read_only=True, data_only=True, keep_links=False)
+
+
+def _column_indexes(columns):
+    # 컬럼 지정(1부터 시작하는 번호 또는 'A', 'C' 같은 문자) → 번호 목록
+    return [column_index_from_string(c) if isinstance(c, str) else int(c) for c in columns]
+
+
+def _convert(value):
+    # pd.read_excel과 같은 셀 값 규칙: 빈 문자열은 결측, 정수 값인 실수는 정수로
+    if value == "":
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _iter_rows(wb, sheet, min_row, max_row, columns, stop):
+    ws = wb[sheet] if isinstance(sheet, str) else wb.worksheets[sheet]
+    # 일부 원본(KOSIS 내려받기 파일 등)은 시트 크기 정보가 'A1:A1'처럼 틀려 있음 → 믿지 않고 끝까지 읽음
+    ws.reset_dimensions()
+    if columns:
+        indexes = _column_indexes(columns)
+        min_col, max_col = min(indexes), max(indexes)
+        offsets = [i - min_col for i in indexes]
+    else:
+        min_col, max_col, offsets = 1, None, None
+
+    for row in ws.iter_rows(min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col, values_only=True):
+        if offsets is not None:
+            row = tuple(_convert(row[i]) if i < len(row) else None for i in offsets)
+        else:
+            row = tuple(_convert(v) for v in row)
+        if stop is not None and stop(row):
+            return
+        yield row
+
+
+def _read(wb, path, sheet, min_row, max_row, columns, stop):
+    # 바이트 수는 openpyxl 내부 속성(wb._archive)을 바꿔 끼워서 셈 → 그 속성이 없는 버전이면 세지 않음 (bytes=None)
+    counter = [0]
+    archive = getattr(wb, "_archive", None)
+    if archive is not None:
+        wb._archive = _CountingArchive(archive, counter)
+    start = time.perf_counter()
+    try:
+        rows = list(_iter_rows(wb, sheet, min_row, max_row, columns, stop))
+    finally:
+        if archive is not None:
+            wb._archive = archive
+
+    # 끝부분의 빈 행 제거 (pd.read_excel과 같은 동작)
+    while rows and all(v is None for v in rows[-1]):
+        rows.pop()
+
+    entry = {"rows": len(rows), "bytes": counter[0] if archive is not None else None, "seconds": round(time.perf_counter() - start, 4)}
+    with _lock:
+        _stats[(os.path.basename(path), sheet)] = entry
+    logger.info("xlsx %s[%s] rows=%d bytes=%s %.3fs", os.path.basename(path), sheet,
+                entry["rows"], entry["bytes"], entry["seconds"])
+    return rows
+
+
+def read_rows(path, sheet=0, min_row=1, max_row=None, columns=None, stop=None):
+    # 행 목록(tuple)을 반환. stop(row)가 True인 행에서 읽기를 멈춤 (그 행은 포함하지 않음)
+    wb = open_workbook(path)
+    try:
+        return _read(wb, path, sheet, min_row, max_row, columns, stop)
+    finally:
+        wb.close()
+
+
+def _width(rows):
+    # 끝부분의 빈 컬럼을 뺀 폭
+    return max((max((i + 1 for i, v in enumerate(row) if v is not None), default=0) for row in rows), default=0)
+
+
+def _unique_names(header_row):
+    # 빈 컬럼명은 'Unnamed: i', 중복 컬럼명은 '.1', '.2'를 붙임 (pd.read_excel과 같은 규칙)
+    names = []
+    for i, name in enumerate(header_row):
+        name = base = f"Unnamed: {i}" if name is None else name
+        n = 0
+        while name in names:
+            n += 1
+            name = f"{base}.{n}"
+        names.append(name)
+    return names
+
+
+def _frame(rows, header, names):
+    width = len(names) if names is not None else _width(rows)
+    rows = [tuple(row[:width]) + (None,) * (width - len(row)) for row in rows]
+    if names is None and header and rows:
+        names, rows = _unique_names(rows[0]), rows[1:]
+    return pd.DataFrame(rows, columns=names if names is not None else range(width))
+
+
+def read_frame(path, sheet=0, header=True, min_row=1, max_row=None, columns=None, names=None, stop=None):
+    # 데이터프레임으로 읽기. header=True면 첫 행(min_row)을 컬럼명으로 사용, names를 주면 그 이름을 사용
+    return _frame(read_rows(path, sheet, min_row, max_row, columns, stop), header, names)
+
+
+def read_frames(path, sheets, header=True, min_row=1, columns=None, stop=None):
+    # 한 통합문서의 여러 시트를 한 번만 열어서 읽기 → {시트 이름: 데이터프레임} (없는 시트는 빠짐)
+    wb = open_workbook(path)
+    try:
+        return {
+            sheet: _frame(_read(wb, path, sheet, min_row, None, columns, stop), header, None)
+            for sheet in sheets if sheet in wb.sheetnames
+        }
+    finally:
+        wb.close()
+
+
+def stats():
+    # 모니터링용: 시트별 마지막 읽기 결과
+    with _lock:
+        return [{"file": f, "sheet": s, **entry} for (f, s), entry in _stats.items()]
@@ -1,6 +1,35 @@
+import os
 from pathlib import Path
 
 import pandas as pd
 
+from plots import crime_rate, population_facility, park_area, traffic, air_pollution, population
+
 app_dir = Path(__file__).parent
 df = pd.read_csv(app_dir / "penguins.csv")
+
+# --- 데이터 파일 경로 ---
+# DASHBOARD_DATA_DIR: 다른 폴더의 원본 사용 (예: cli.py generate-data로 만든 합성 원본으로 오프라인 실행)
+data_dir = Path(os.environ.get("DASHBOARD_DATA_DIR") or app_dir / "data")
+PARK_FP = str(data_dir / "시군별_공원_면적.xlsx")
+ACC_FP = str(data_dir / "경상북도 시도별 교통사고 건수.xlsx")
+FACILITY_FP = str(data_dir / "한국문화정보원_전국 반려동물 동반 가능 문화시설 위치 데이터_20221130.csv")
+POP_FP = str(data_dir / "경상북도 주민등록.xlsx")
+CRIME_FP = str(data_dir / "경찰청_범죄 발생 지역별 통계.xlsx")
+POLLUTION_FP = str(data_dir / "월별_도시별_대기오염도.xlsx")
+DATA_FILES = (PARK_FP, ACC_FP, FACILITY_FP, POP_FP, CRIME_FP, POLLUTION_FP)
+
+# --- 지도 (plots/map.py가 GeoJSON → www/ 아래 HTML + 경계 geometry 파일 생성) ---
+www_dir = app_dir / "www"
+GEOJSON_FP = str(data_dir / "gyeongbuk_polygon_4326.geojson")
+MAP_HTML_FP = str(www_dir / "gyeongbuk_map.html")
+
+# (원본 파일, loader) 목록 - 앱이 읽는 모든 데이터
+SOURCES = [
+    (CRIME_FP, crime_rate.load_crime_data),
+    (POP_FP, population.load_population),
+    (FACILITY_FP, population_facility.load_facility_data),
+    (PARK_FP, park_area.load_park_data),
+    (POLLUTION_FP, air_pollution.load_air_pollution_data),
+    (ACC_FP, traffic.load_accident_data),
+]
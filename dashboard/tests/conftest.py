@@ -0,0 +1,5 @@
+# 테스트는 dashboard/ 폴더 기준으로 import (앱과 같은 `from plots import ...`)
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
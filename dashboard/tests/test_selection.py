@@ -0,0 +1,106 @@
+# 지역 선택은 그래프 강조만 바꾸고 지표 계산·그래프 생성은 다시 실행하지 않아야 함
+# - 합성 원본(plots/synthetic.py)으로 앱을 띄우고 세션 웹소켓으로 selected_region 입력을 보냄
+# - 세는 것: 지표 테이블 조회(load_metrics = metrics_task), 차트 작업(chart_json = chart_task),
+#   instrument 계측의 analyze_* / plot_* 호출 횟수
+#   (지표 테이블은 데이터 버전마다 캐시되므로 analyze_*만 세면 metrics_task가 지역에 의존해도 알 수 없음)
+# - 메시지 만들기·해석은 부하 시험(benchmarks/loadtest.py)과 같은 함수 사용
+# - lifespan(warm-up)은 실행하지 않음 → www/에 지도를 쓰지 않음
+import collections
+import importlib
+import json
+import socket
+import threading
+import time
+
+import pytest
+import uvicorn
+from websockets.sync.client import connect
+
+from benchmarks import loadtest
+
+TIMEOUT = 60
+
+
+@pytest.fixture(scope="module")
+def app_module(tmp_path_factory):
+    from plots import regions, synthetic
+
+    directory = tmp_path_factory.mktemp("data")
+    synthetic.generate(directory, synthetic.make_spec(len(regions.default().in_province(regions.GYEONGBUK))))
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("DASHBOARD_DATA_DIR", str(directory))   # shared.py가 import될 때 읽음
+        mp.setenv("DASHBOARD_METRICS", "1")
+        importlib.reload(importlib.import_module("shared"))
+        yield importlib.reload(importlib.import_module("app"))
+
+
+@pytest.fixture(scope="module")
+def calls(app_module):
+    # 세션의 reactive 작업이 부르는 app 함수를 감싸서 호출 횟수를 셈
+    counts = collections.Counter()
+
+    def counted(name, fn):
+        def wrapper(*args, **kwargs):
+            counts[name] += 1
+            return fn(*args, **kwargs)
+        return wrapper
+
+    with pytest.MonkeyPatch.context() as mp:
+        for name in ("load_metrics", "chart_json"):
+            mp.setattr(app_module, name, counted(name, getattr(app_module, name)))
+        yield counts
+
+
+@pytest.fixture(scope="module")
+def server_url(app_module, calls):
+    # 같은 프로세스의 스레드에서 uvicorn 실행 (호출 횟수와 instrument 계측 값을 테스트에서 바로 읽을 수 있도록)
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app_module.app, host="127.0.0.1", port=port,
+                                           lifespan="off", log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + TIMEOUT
+    while not server.started:
+        assert time.monotonic() < deadline, "서버 시작 시간 초과"
+        time.sleep(0.05)
+    yield f"ws://127.0.0.1:{port}/websocket/"
+    server.should_exit = True
+    thread.join(TIMEOUT)
+
+
+def instrumented_calls():
+    from plots import instrument
+    return {(kind, name): value["count"] for (metric, kind, name), value in instrument.snapshot().items()
+            if metric == "dashboard_call_seconds" and kind in ("analyze", "plot")}
+
+
+def receive(ws):
+    return json.loads(ws.recv(timeout=TIMEOUT))
+
+
+def test_region_change_does_not_rerun_analysis_or_figures(server_url, calls):
+    from plots import regions
+
+    names = [r.name for r in regions.default().in_province(regions.GYEONGBUK)]
+    with connect(server_url, max_size=None) as ws:
+        ws.send(loadtest.init_message(regions.GYEONGBUK))
+        seen = set()
+        while not seen >= set(loadtest.PLOTS):
+            seen |= loadtest.plot_values(receive(ws))
+
+        before = (dict(calls), instrumented_calls())
+        assert calls["load_metrics"] >= 1
+        assert calls["chart_json"] >= len(loadtest.PLOTS)
+        assert before[1].get(("analyze", "build_metrics"), 0) >= 1
+
+        for tag, name in enumerate(names[:3]):
+            update = loadtest.ClickUpdate(tag)
+            for message in loadtest.click_messages(name, tag):
+                ws.send(message)
+            while not update.feed(receive(ws)):
+                pass
+            assert update.widgets, f"{name} 선택 후 강조가 바뀐 위젯이 없음"
+
+    assert (dict(calls), instrumented_calls()) == before
@@ -0,0 +1,50 @@
+# 앱 시작 시 미리 해 둘 작업(warm-up) 실행기
+# - 단계별로 순서대로 실행하고 걸린 시간을 로그로 남김
+# - 모든 단계가 끝나야 status()["ready"]가 True → /ready 응답에 사용
+import logging
+import threading
+import time
+
+logger = logging.getLogger("dashboard.warmup")
+
+_lock = threading.Lock()
+_state = {"ready": False, "running": False, "error": None, "steps": {}, "seconds": None}
+
+
+def run(steps):
+    # steps: [(단계 이름, 인자 없는 함수), ...]
+    with _lock:
+        _state.update(ready=False, running=True, error=None, steps={}, seconds=None)
+
+    start = time.perf_counter()
+    for name, step in steps:
+        step_start = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            logger.exception("warm-up 실패: %s", name)
+            with _lock:
+                _state.update(running=False, error=f"{name}: {e}")
+            return False
+        elapsed = time.perf_counter() - step_start
+        logger.info("warm-up %-10s %.3fs", name, elapsed)
+        with _lock:
+            _state["steps"][name] = round(elapsed, 3)
+
+    total = time.perf_counter() - start
+    logger.info("warm-up 완료 %.3fs", total)
+    with _lock:
+        _state.update(ready=True, running=False, seconds=round(total, 3))
+    return True
+
+
+def start(steps):
+    # 서버는 바로 요청을 받을 수 있게 두고, warm-up은 별도 스레드에서 실행
+    thread = threading.Thread(target=run, args=(steps,), name="warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def status():
+    with _lock:
+        return {**_state, "steps": dict(_state["steps"])}